@@ -0,0 +1,90 @@
+"""
+Load test comparing a shared MCP workbench with a workbench per request.
+
+Starts a local MCP server, then sends the same requests twice: once with a new McpWorkbench
+per request, as the template did before, and once through the SharedMcpWorkbench used by
+main.py. Each request lists the tools and calls one, like an agent turn that uses a tool.
+
+Run from the agent root: python -m benchmarks.mcp_load --requests 200 --concurrency 20
+"""
+
+import argparse
+import asyncio
+import statistics
+import threading
+import time
+
+import uvicorn
+from autogen_ext.tools.mcp import McpWorkbench, StreamableHttpServerParams
+from mcp.server.fastmcp import FastMCP
+
+from mcp_client.client import SharedMcpWorkbench
+
+PORT = 8765
+
+
+def start_server() -> StreamableHttpServerParams:
+    server = FastMCP("benchmark", log_level="ERROR")
+
+    @server.tool()
+    def add_numbers(a: int, b: int) -> int:
+        """Return the sum of two numbers"""
+        return a + b
+
+    config = uvicorn.Config(server.streamable_http_app(), port=PORT, log_level="error")
+    uvicorn_server = uvicorn.Server(config)
+    threading.Thread(target=uvicorn_server.run, daemon=True).start()
+    while not uvicorn_server.started:
+        time.sleep(0.05)
+    return StreamableHttpServerParams(url=f"http://127.0.0.1:{PORT}/mcp")
+
+
+async def turn(workbench: McpWorkbench) -> None:
+    await workbench.list_tools()
+    await workbench.call_tool("add_numbers", {"a": 1, "b": 2})
+
+
+async def per_request(params: StreamableHttpServerParams) -> None:
+    workbench = McpWorkbench(server_params=params)
+    await workbench.start()
+    try:
+        await turn(workbench)
+    finally:
+        await workbench.stop()
+
+
+async def run(name: str, request, requests: int, concurrency: int) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one() -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            await request()
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    print(
+        f"{name:<12} {requests / elapsed:8.1f} req/s"
+        f"  p50 {statistics.median(latencies) * 1000:7.1f} ms"
+        f"  p95 {latencies[int(len(latencies) * 0.95) - 1] * 1000:7.1f} ms"
+    )
+
+
+async def main(requests: int, concurrency: int) -> None:
+    params = start_server()
+    await run("per request", lambda: per_request(params), requests, concurrency)
+    shared = SharedMcpWorkbench(params)
+    await run("shared", lambda: turn(shared), requests, concurrency)
+    await shared.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency))
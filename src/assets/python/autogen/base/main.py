@@ -1,13 +1,22 @@
 import os
 from autogen_agentchat.agents import AssistantAgent
-from autogen_core.tools import FunctionTool
+from autogen_agentchat.messages import (
+    ModelClientStreamingChunkEvent,
+    ToolCallExecutionEvent,
+    ToolCallRequestEvent,
+    ToolCallSummaryMessage,
+)
+from autogen_core.tools import FunctionTool, StaticStreamWorkbench
 from bedrock_agentcore.runtime import BedrockAgentCoreApp
 from model.load import load_model
-from mcp_client.client import get_streamable_http_mcp_tools
+from mcp_client.client import get_streamable_http_mcp_workbench
 
 app = BedrockAgentCoreApp()
 log = app.logger
 
+# Set to 1, or send "stream": true in the payload, to stream tokens as they are generated
+STREAM_RESPONSES = os.getenv("STREAM_RESPONSES") == "1"
+
 
 # Define a simple function tool
 def add_numbers(a: int, b: int) -> int:
@@ -22,25 +31,48 @@ add_numbers_tool = FunctionTool(
 # Define a collection of tools used by the model
 tools = [add_numbers_tool]
 
+# Local tools and the MCP session are set up once and shared by every request
+workbench = [StaticStreamWorkbench(tools), get_streamable_http_mcp_workbench()]
+
+
+async def stream_agent(agent, prompt):
+    """Yields model tokens as text and tool progress as {"event": ...} objects."""
+    async for message in agent.run_stream(task=prompt):
+        if isinstance(message, ModelClientStreamingChunkEvent):
+            yield message.content
+        elif isinstance(message, ToolCallRequestEvent):
+            for call in message.content:
+                yield {"event": "tool_call", "name": call.name}
+        elif isinstance(message, ToolCallExecutionEvent):
+            for result in message.content:
+                yield {"event": "tool_result", "name": result.name, "status": "error" if result.is_error else "success"}
+        elif isinstance(message, ToolCallSummaryMessage):
+            # Without reflect_on_tool_use the answer is the tool output, which is not streamed as tokens
+            yield message.to_text()
+
 
 @app.entrypoint
 async def invoke(payload, context):
     log.info("Invoking Agent.....")
 
-    # Get MCP Tools
-    mcp_tools = await get_streamable_http_mcp_tools()
+    stream = payload.get("stream", STREAM_RESPONSES)
 
-    # Define an AssistantAgent with the model and tools
+    # Only the agent, which holds this request's conversation, is created per request
     agent = AssistantAgent(
         name="{{ name }}",
         model_client=load_model(),
-        tools=tools + mcp_tools,
+        workbench=workbench,
         system_message="You are a helpful assistant. Use tools when appropriate.",
+        model_client_stream=stream,
     )
 
     # Process the user prompt
     prompt = payload.get("prompt", "What can you help me with?")
 
+    if stream:
+        # Returning an async generator streams each item to the client as a server-sent event
+        return stream_agent(agent, prompt)
+
     # Run the agent
     result = await agent.run(task=prompt)
 
@@ -1,18 +1,143 @@
-from typing import List
-from autogen_ext.tools.mcp import (
-    StreamableHttpMcpToolAdapter,
-    StreamableHttpServerParams,
-    mcp_server_tools,
-)
+import asyncio
+import atexit
+import logging
+import os
+import time
+from typing import Any, Awaitable, Callable, List
+from autogen_core.tools import ToolResult, ToolSchema
+from autogen_ext.tools.mcp import McpWorkbench, StreamableHttpServerParams
+
+logger = logging.getLogger(__name__)
 
 # ExaAI provides information about code through web searches, crawling and code context searches through their platform. Requires no authentication
 EXAMPLE_MCP_ENDPOINT = "https://mcp.exa.ai/mcp"
 
+# Seconds listed MCP tools are reused before they are re-listed in the background, 0 lists on every call
+TOOLS_CACHE_TTL_SECONDS = float(os.getenv("MCP_TOOLS_CACHE_TTL_SECONDS", "300"))
+
+
+class ToolsCache:
+    """
+    Caches the tools listed from MCP servers across invocations.
+
+    The first call lists the tools and waits for them. Later calls return the cached tools
+    without a network round trip; once they are older than ttl, a single background task
+    re-lists them while callers keep using the cached copy.
+    """
+
+    def __init__(self, load: Callable[[], Awaitable[list]], ttl: float = TOOLS_CACHE_TTL_SECONDS):
+        self._load = load
+        self.ttl = ttl
+        self._tools: list | None = None
+        self._loaded_at = 0.0
+        self._lock = asyncio.Lock()
+        self._refresh: asyncio.Task | None = None
+
+    async def get(self) -> list:
+        if self.ttl <= 0:
+            return await self._load()
+        if self._tools is None:
+            # Concurrent cold requests share a single listing
+            async with self._lock:
+                if self._tools is None:
+                    self._tools = await self._load()
+                    self._loaded_at = time.monotonic()
+        elif self._refresh is None and time.monotonic() - self._loaded_at > self.ttl:
+            # The task copies this request's context, so gateway credentials resolve as they do inline
+            self._refresh = asyncio.create_task(self._refresh_tools())
+        return self._tools
+
+    def invalidate(self) -> None:
+        """Re-list the tools on the next call, e.g. after the server reports that its tools changed."""
+        self._loaded_at = float("-inf")
+
+    async def _refresh_tools(self) -> None:
+        try:
+            self._tools = await self._load()
+        except Exception:
+            logger.warning("Failed to refresh MCP tools, keeping the cached tools", exc_info=True)
+        finally:
+            # A failed refresh is retried after another TTL rather than on every request
+            self._loaded_at = time.monotonic()
+            self._refresh = None
+
+
+class SharedMcpWorkbench(McpWorkbench):
+    """
+    McpWorkbench shared by every request for the life of the process.
+
+    Its MCP session stays open between requests. If the session ends, for example because the
+    server restarted, its actor is stopped and the next request starts a new session instead of
+    hanging. A tool listing cut off by the end of a session is retried once on the new session;
+    a tool call is not, because the server may already have run it, and it fails with
+    ConnectionError instead. Tool schemas are served from a ToolsCache, so agents do not list
+    tools on every model call.
+    """
+
+    def __init__(self, server_params: StreamableHttpServerParams):
+        super().__init__(server_params=server_params)
+        self._tools_cache = ToolsCache(self._list_tools)
+
+    async def list_tools(self) -> List[ToolSchema]:
+        return await self._tools_cache.get()
+
+    async def call_tool(self, *args, **kwargs) -> ToolResult:
+        return await self._request(lambda: super(SharedMcpWorkbench, self).call_tool(*args, **kwargs), retry=False)
+
+    async def _list_tools(self) -> List[ToolSchema]:
+        return await self._request(lambda: super(SharedMcpWorkbench, self).list_tools(), retry=True)
+
+    async def _request(self, send: Callable[[], Awaitable[Any]], retry: bool) -> Any:
+        for attempt in range(2 if retry else 1):
+            actor = await self._ensure_session()
+            actor_task = actor._actor_task
+            request = asyncio.ensure_future(send())
+            # A request in flight when the session ends is never answered, so wait on both.
+            # Without a task the actor has already stopped, and the request fails on its own.
+            waits = {request} if actor_task is None else {request, actor_task}
+            await asyncio.wait(waits, return_when=asyncio.FIRST_COMPLETED)
+            if request.done():
+                return request.result()
+            request.cancel()
+            logger.info("MCP session ended during a request")
+            await self._drop_session(actor)
+        raise ConnectionError("MCP session ended before the request completed")
+
+    async def _ensure_session(self) -> Any:
+        # The session actor stops when the server closes the session or becomes unreachable
+        actor = self._actor
+        if actor is not None and not actor._active:
+            logger.info("MCP session ended, reconnecting")
+            await self._drop_session(actor)
+        if self._actor is None:
+            await self.start()
+        return self._actor
+
+    async def _drop_session(self, actor: Any) -> None:
+        """
+        Stop an ended session's actor and release its exit hook, so reconnects do not leak actors.
+        Does nothing if another request has already replaced it, so a healthy new session is kept.
+        """
+        if actor is None or self._actor is not actor:
+            return
+        # Cleared first, so concurrent requests start a new session instead of reusing this one
+        self._actor = None
+        try:
+            await actor.close()
+        except Exception:
+            logger.debug("Failed to stop the ended MCP session", exc_info=True)
+        atexit.unregister(actor._sync_shutdown)
+
+_workbench: SharedMcpWorkbench | None = None
+
 
-async def get_streamable_http_mcp_tools() -> List[StreamableHttpMcpToolAdapter]:
+def get_streamable_http_mcp_workbench() -> SharedMcpWorkbench:
     """
-    Returns MCP Tools compatible with AutoGen.
+    Returns the MCP workbench compatible with AutoGen.
+    It is created once and shared by all requests.
     """
-    # to use an MCP server that supports bearer authentication, add headers={"Authorization": f"Bearer {access_token}"}
-    server_params = StreamableHttpServerParams(url=EXAMPLE_MCP_ENDPOINT)
-    return await mcp_server_tools(server_params)
+    global _workbench
+    if _workbench is None:
+        # to use an MCP server that supports bearer authentication, add headers={"Authorization": f"Bearer {access_token}"}
+        _workbench = SharedMcpWorkbench(StreamableHttpServerParams(url=EXAMPLE_MCP_ENDPOINT))
+    return _workbench
@@ -1,16 +1,24 @@
+import threading
+
+from autogen_core.models import ChatCompletionClient
+
 {{#if (eq modelProvider "Bedrock")}}
 import os
 from autogen_ext.models.anthropic import AnthropicBedrockChatCompletionClient
 from autogen_core.models import ModelInfo, ModelFamily
+from model.usage import AnthropicCacheMessages
 
 # Uses global inference profile for Claude Sonnet 4.5
 # https://docs.aws.amazon.com/bedrock/latest/userguide/inference-profiles-support.html
 MODEL_ID = "global.anthropic.claude-sonnet-4-5-20250929-v1:0"
 
+# Set to 1 to cache the system prompt and tool definitions, so later turns read them from the cache
+PROMPT_CACHING = os.getenv("PROMPT_CACHING") == "1"
+
 
-def load_model() -> AnthropicBedrockChatCompletionClient:
-    """Get Bedrock model client using IAM credentials."""
-    return AnthropicBedrockChatCompletionClient(
+def _create_model() -> AnthropicBedrockChatCompletionClient:
+    """Create a Bedrock model client using IAM credentials."""
+    client = AnthropicBedrockChatCompletionClient(
         model=MODEL_ID,
         model_info=ModelInfo(
             vision=False,
@@ -21,15 +29,23 @@ def load_model() -> AnthropicBedrockChatCompletionClient:
         ),
         bedrock_info={"aws_region": os.environ.get("AWS_REGION", "us-east-1")}
     )
+    # AutoGen calls the Anthropic SDK client directly, so caching and its metrics hook in there, see model/usage.py
+    client._client.messages = AnthropicCacheMessages(client._client.messages, cache_system=PROMPT_CACHING)
+    return client
 {{/if}}
 {{#if (eq modelProvider "Anthropic")}}
 import os
 from autogen_ext.models.anthropic import AnthropicChatCompletionClient
 from bedrock_agentcore.identity.auth import requires_api_key
+from model.credentials import CredentialCache
+from model.usage import AnthropicCacheMessages
 
 IDENTITY_PROVIDER_NAME = "{{identityProviders.[0].name}}"
 IDENTITY_ENV_VAR = "{{identityProviders.[0].envVarName}}"
 
+# Set to 1 to cache the system prompt and tool definitions, so later turns read them from the cache
+PROMPT_CACHING = os.getenv("PROMPT_CACHING") == "1"
+
 
 @requires_api_key(provider_name=IDENTITY_PROVIDER_NAME)
 def _agentcore_identity_api_key_provider(api_key: str) -> str:
@@ -37,6 +53,10 @@ def _agentcore_identity_api_key_provider(api_key: str) -> str:
     return api_key
 
 
+# Fetched once for the process and refreshed before it expires, see model/credentials.py
+_api_key_cache = CredentialCache(IDENTITY_PROVIDER_NAME, _agentcore_identity_api_key_provider)
+
+
 def _get_api_key() -> str:
     """
     Uses AgentCore Identity for API key management in deployed environments.
@@ -49,20 +69,24 @@ def _get_api_key() -> str:
                 f"{IDENTITY_ENV_VAR} not found. Add {IDENTITY_ENV_VAR}=your-key to .env.local"
             )
         return api_key
-    return _agentcore_identity_api_key_provider()
+    return _api_key_cache.get()
 
 
-def load_model() -> AnthropicChatCompletionClient:
-    """Get authenticated Anthropic model client."""
-    return AnthropicChatCompletionClient(
+def _create_model() -> AnthropicChatCompletionClient:
+    """Create an authenticated Anthropic model client."""
+    client = AnthropicChatCompletionClient(
         model="claude-sonnet-4-5-20250929",
         api_key=_get_api_key()
     )
+    # AutoGen calls the Anthropic SDK client directly, so caching and its metrics hook in there, see model/usage.py
+    client._client.messages = AnthropicCacheMessages(client._client.messages, cache_system=PROMPT_CACHING)
+    return client
 {{/if}}
 {{#if (eq modelProvider "OpenAI")}}
 import os
 from autogen_ext.models.openai import OpenAIChatCompletionClient
 from bedrock_agentcore.identity.auth import requires_api_key
+from model.credentials import CredentialCache
 
 IDENTITY_PROVIDER_NAME = "{{identityProviders.[0].name}}"
 IDENTITY_ENV_VAR = "{{identityProviders.[0].envVarName}}"
@@ -74,6 +98,10 @@ def _agentcore_identity_api_key_provider(api_key: str) -> str:
     return api_key
 
 
+# Fetched once for the process and refreshed before it expires, see model/credentials.py
+_api_key_cache = CredentialCache(IDENTITY_PROVIDER_NAME, _agentcore_identity_api_key_provider)
+
+
 def _get_api_key() -> str:
     """
     Uses AgentCore Identity for API key management in deployed environments.
@@ -86,11 +114,11 @@ def _get_api_key() -> str:
                 f"{IDENTITY_ENV_VAR} not found. Add {IDENTITY_ENV_VAR}=your-key to .env.local"
             )
         return api_key
-    return _agentcore_identity_api_key_provider()
+    return _api_key_cache.get()
 
 
-def load_model() -> OpenAIChatCompletionClient:
-    """Get authenticated OpenAI model client."""
+def _create_model() -> OpenAIChatCompletionClient:
+    """Create an authenticated OpenAI model client."""
     return OpenAIChatCompletionClient(
         model="gpt-4o",
         api_key=_get_api_key()
@@ -100,6 +128,7 @@ def load_model() -> OpenAIChatCompletionClient:
 import os
 from autogen_ext.models.openai import OpenAIChatCompletionClient
 from bedrock_agentcore.identity.auth import requires_api_key
+from model.credentials import CredentialCache
 
 IDENTITY_PROVIDER_NAME = "{{identityProviders.[0].name}}"
 IDENTITY_ENV_VAR = "{{identityProviders.[0].envVarName}}"
@@ -111,6 +140,10 @@ def _agentcore_identity_api_key_provider(api_key: str) -> str:
     return api_key
 
 
+# Fetched once for the process and refreshed before it expires, see model/credentials.py
+_api_key_cache = CredentialCache(IDENTITY_PROVIDER_NAME, _agentcore_identity_api_key_provider)
+
+
 def _get_api_key() -> str:
     """
     Uses AgentCore Identity for API key management in deployed environments.
@@ -123,14 +156,39 @@ def _get_api_key() -> str:
                 f"{IDENTITY_ENV_VAR} not found. Add {IDENTITY_ENV_VAR}=your-key to .env.local"
             )
         return api_key
-    return _agentcore_identity_api_key_provider()
+    return _api_key_cache.get()
 
 
-def load_model() -> OpenAIChatCompletionClient:
-    """Get authenticated Gemini model client via OpenAI-compatible API."""
+def _create_model() -> OpenAIChatCompletionClient:
+    """Create an authenticated Gemini model client via OpenAI-compatible API."""
     return OpenAIChatCompletionClient(
         model="gemini-2.0-flash",
         api_key=_get_api_key(),
         base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
     )
 {{/if}}
+
+
+_model = None
+_model_api_key = None
+_model_lock = threading.Lock()
+
+
+def load_model() -> ChatCompletionClient:
+    """
+    Return the process-wide model client, creating it on first use.
+    Every request shares it, so its HTTP connection pool and API key are reused.
+    """
+    global _model, _model_api_key
+{{#if (eq modelProvider "Bedrock")}}
+    api_key = None
+{{else}}
+    # Served from the credential cache; a rotated key gets a new client
+    api_key = _get_api_key()
+{{/if}}
+    if _model is None or api_key != _model_api_key:
+        with _model_lock:
+            if _model is None or api_key != _model_api_key:
+                _model = _create_model()
+                _model_api_key = api_key
+    return _model
@@ -0,0 +1,67 @@
+import logging
+
+from opentelemetry import metrics
+
+logger = logging.getLogger(__name__)
+meter = metrics.get_meter(__name__)
+
+_cache_read_tokens = meter.create_counter(
+    "model.cache_read_input_tokens",
+    unit="{token}",
+    description="Input tokens served from the prompt cache",
+)
+_cache_write_tokens = meter.create_counter(
+    "model.cache_write_input_tokens",
+    unit="{token}",
+    description="Input tokens written to the prompt cache",
+)
+
+
+def record_cache_usage(read_tokens: int, write_tokens: int) -> None:
+    """Logs and counts the prompt cache reads and writes reported for a model call."""
+    if not read_tokens and not write_tokens:
+        return
+    _cache_read_tokens.add(read_tokens)
+    _cache_write_tokens.add(write_tokens)
+    logger.info("Prompt cache: %d input tokens read, %d written", read_tokens, write_tokens)
+
+
+def _record_anthropic_usage(usage) -> None:
+    record_cache_usage(
+        getattr(usage, "cache_read_input_tokens", None) or 0,
+        getattr(usage, "cache_creation_input_tokens", None) or 0,
+    )
+
+
+class AnthropicCacheMessages:
+    """
+    Wraps the messages resource of the Anthropic SDK client that AutoGen's Anthropic clients call.
+
+    Records the prompt cache usage of every response, which AutoGen's RequestUsage leaves out.
+    With cache_system set, the system prompt is also marked as a cache breakpoint. Tool
+    definitions come before the system prompt in a request, so the breakpoint covers them too.
+    """
+
+    def __init__(self, messages, cache_system: bool):
+        self._messages = messages
+        self._cache_system = cache_system
+
+    async def create(self, **kwargs):
+        system = kwargs.get("system")
+        if self._cache_system and isinstance(system, str) and system:
+            kwargs["system"] = [{"type": "text", "text": system, "cache_control": {"type": "ephemeral"}}]
+        response = await self._messages.create(**kwargs)
+        if kwargs.get("stream"):
+            return self._record_stream(response)
+        _record_anthropic_usage(response.usage)
+        return response
+
+    async def _record_stream(self, stream):
+        async for event in stream:
+            # Input and cache usage arrive once, at the start of the message
+            if event.type == "message_start":
+                _record_anthropic_usage(event.message.usage)
+            yield event
+
+    def __getattr__(self, name):
+        return getattr(self._messages, name)
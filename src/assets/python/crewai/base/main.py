@@ -1,7 +1,9 @@
+import threading
 from crewai import Agent, Crew, Task, Process
 from crewai.tools import tool
 from bedrock_agentcore.runtime import BedrockAgentCoreApp
 from model.load import load_model
+from worker.pool import WorkerPool
 
 app = BedrockAgentCoreApp()
 log = app.logger
@@ -17,11 +19,15 @@ def add_numbers(a: int, b: int) -> int:
 # Define a collection of tools used by the model
 tools = [add_numbers]
 
+# Runs crews off the event loop, see worker/pool.py for the concurrency and queue limits
+crew_pool = WorkerPool()
+
+# One crew per worker thread, see get_crew
+_local = threading.local()
 
-@app.entrypoint
-def invoke(payload, context):
-    log.info("Invoking Agent.....")
 
+def build_crew() -> Crew:
+    """Define the crew. Only the inputs passed to kickoff change between requests."""
     # Define the Agent with Tools
     agent = Agent(
         role="Question Answering Assistant",
@@ -39,13 +45,42 @@ def invoke(payload, context):
     )
 
     # Create the Crew
-    crew = Crew(agents=[agent], tasks=[task], process=Process.sequential)
+    return Crew(agents=[agent], tasks=[task], process=Process.sequential)
+
+
+def get_crew() -> Crew:
+    """
+    Return this worker thread's crew, building it on first use.
+    kickoff fills the prompt into the crew's tasks in place, so a crew must not run two
+    requests at once; each worker thread keeps its own and runs one request at a time.
+    """
+    model = load_model()
+    crew = getattr(_local, "crew", None)
+    # A rotated API key comes with a new model
+    if crew is None or _local.model is not model:
+        crew = _local.crew = build_crew()
+        _local.model = model
+    return crew
+
+
+def run_crew(prompt: str):
+    crew = get_crew()
+    for agent in crew.agents:
+        # Clear what agents record about the previous run, so it cannot leak into this one
+        agent.tools_results = []
+        agent._times_executed = 0
+    return crew.kickoff(inputs={"prompt": prompt})
+
+
+@app.entrypoint
+async def invoke(payload, context):
+    log.info("Invoking Agent.....")
 
     # Process the user prompt
     prompt = payload.get("prompt", "What can you help me with?")
 
-    # Run the crew
-    result = crew.kickoff(inputs={"prompt": prompt})
+    # Run the crew on a worker thread, rejecting the request if the pool is saturated
+    result = await crew_pool.run(run_crew, prompt)
 
     # Return result
     return {"result": result.raw}
@@ -0,0 +1,136 @@
+import contextvars
+import logging
+import os
+import threading
+import time
+from typing import Callable, Optional
+
+from opentelemetry import metrics
+
+logger = logging.getLogger(__name__)
+meter = metrics.get_meter(__name__)
+
+# Seconds a fetched credential is used before it must be fetched again
+TTL_SECONDS = float(os.getenv("CREDENTIAL_CACHE_TTL_SECONDS", "3600"))
+# Seconds before the TTL ends at which a request starts a background refresh
+REFRESH_BEFORE_SECONDS = float(os.getenv("CREDENTIAL_CACHE_REFRESH_BEFORE_SECONDS", "300"))
+# Seconds to wait before retrying a background refresh that failed
+REFRESH_RETRY_SECONDS = 30.0
+
+_fetches = meter.create_counter("credentials.fetches", description="Credential fetches from AgentCore Identity")
+_fetch_time = meter.create_histogram(
+    "credentials.fetch_time",
+    unit="s",
+    description="Time taken to fetch a credential from AgentCore Identity",
+)
+
+
+class CredentialCache:
+    """
+    Process-wide cache of one credential, such as an AgentCore Identity API key.
+
+    Concurrent requests that find the cache empty or expired share a single fetch. Once the
+    credential is within refresh_before seconds of its ttl, the request that notices starts
+    one background refresh and keeps using the cached value meanwhile. The refresh runs in a
+    copy of that request's context, because AgentCore Identity needs the request's workload
+    access token.
+
+    lifetime, if given, returns the seconds a fetched value is valid for, such as the time left
+    before an OAuth token's exp claim, or None to use ttl.
+
+    Every fetch is counted in the credentials.fetches metric, and on_fetch, if given, is
+    called with the credential name, the fetch duration and the error raised, if any.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        fetch: Callable[[], str],
+        ttl: float = TTL_SECONDS,
+        refresh_before: float = REFRESH_BEFORE_SECONDS,
+        on_fetch: Optional[Callable[[str, float, Optional[Exception]], None]] = None,
+        lifetime: Optional[Callable[[str], Optional[float]]] = None,
+    ):
+        self.name = name
+        self._fetch = fetch
+        self.ttl = ttl
+        self.refresh_before = refresh_before
+        self._on_fetch = on_fetch
+        self._lifetime = lifetime
+        self._value: Optional[str] = None
+        self._fetched_at = 0.0
+        self._expires_in = ttl
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self._refresh_after = 0.0
+
+    def get(self) -> str:
+        if not self.fresh:
+            with self._lock:
+                # Another request may have fetched it while this one waited
+                if not self.fresh:
+                    self._store(self._timed_fetch())
+        elif (
+            time.monotonic() - self._fetched_at >= self._expires_in - self.refresh_before
+            and not self._refreshing
+            and time.monotonic() >= self._refresh_after
+        ):
+            self._start_refresh()
+        return self._value
+
+    @property
+    def fresh(self) -> bool:
+        """Whether get() can return the cached value without fetching it first."""
+        return self._value is not None and time.monotonic() - self._fetched_at < self._expires_in
+
+    def invalidate(self, value: Optional[str] = None) -> None:
+        """
+        Fetch the credential again on the next get(), e.g. after it was rejected.
+        If value is given, only while it is still the cached value, so callers that were all
+        rejected with the same value cause a single fetch.
+        """
+        if value is None or value == self._value:
+            self._fetched_at = float("-inf")
+
+    def _start_refresh(self) -> None:
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        context = contextvars.copy_context()
+        threading.Thread(target=context.run, args=(self._refresh,), name=f"refresh-{self.name}", daemon=True).start()
+
+    def _refresh(self) -> None:
+        try:
+            value = self._timed_fetch()
+            with self._lock:
+                self._store(value)
+        except Exception:
+            # The cached value stays in use until it expires, then requests fetch it inline
+            logger.warning("Failed to refresh credential %s", self.name, exc_info=True)
+            self._refresh_after = time.monotonic() + REFRESH_RETRY_SECONDS
+        finally:
+            self._refreshing = False
+
+    def _store(self, value: str) -> None:
+        if self._value is not None and value != self._value:
+            logger.info("Credential %s was rotated", self.name)
+        expires_in = self._lifetime(value) if self._lifetime else None
+        self._value = value
+        self._fetched_at = time.monotonic()
+        self._expires_in = self.ttl if expires_in is None else max(expires_in, 0.0)
+
+    def _timed_fetch(self) -> str:
+        start = time.monotonic()
+        error = None
+        try:
+            return self._fetch()
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            duration = time.monotonic() - start
+            _fetches.add(1, {"credential": self.name, "outcome": "error" if error else "success"})
+            _fetch_time.record(duration, {"credential": self.name})
+            if self._on_fetch:
+                self._on_fetch(self.name, duration, error)
@@ -1,19 +1,21 @@
-{{#if (eq modelProvider "Bedrock")}}
+import threading
+
 from crewai import LLM
 
+{{#if (eq modelProvider "Bedrock")}}
 # Uses global inference profile for Claude Sonnet 4.5
 # https://docs.aws.amazon.com/bedrock/latest/userguide/inference-profiles-support.html
 MODEL_ID = "bedrock/global.anthropic.claude-sonnet-4-5-20250929-v1:0"
 
 
-def load_model() -> LLM:
-    """Get Bedrock model client using IAM credentials."""
+def _create_model() -> LLM:
+    """Create a Bedrock model client using IAM credentials."""
     return LLM(model=MODEL_ID)
 {{/if}}
 {{#if (eq modelProvider "Anthropic")}}
 import os
-from crewai import LLM
 from bedrock_agentcore.identity.auth import requires_api_key
+from model.credentials import CredentialCache
 
 IDENTITY_PROVIDER_NAME = "{{identityProviders.[0].name}}"
 IDENTITY_ENV_VAR = "{{identityProviders.[0].envVarName}}"
@@ -25,6 +27,10 @@ def _agentcore_identity_api_key_provider(api_key: str) -> str:
     return api_key
 
 
+# Fetched once for the process and refreshed before it expires, see model/credentials.py
+_api_key_cache = CredentialCache(IDENTITY_PROVIDER_NAME, _agentcore_identity_api_key_provider)
+
+
 def _get_api_key() -> str:
     """
     Uses AgentCore Identity for API key management in deployed environments.
@@ -37,11 +43,11 @@ def _get_api_key() -> str:
                 f"{IDENTITY_ENV_VAR} not found. Add {IDENTITY_ENV_VAR}=your-key to .env.local"
             )
         return api_key
-    return _agentcore_identity_api_key_provider()
+    return _api_key_cache.get()
 
 
-def load_model() -> LLM:
-    """Get authenticated Anthropic model client."""
+def _create_model() -> LLM:
+    """Create an authenticated Anthropic model client."""
     api_key = _get_api_key()
     # CrewAI requires ANTHROPIC_API_KEY env var (ignores api_key parameter)
     os.environ["ANTHROPIC_API_KEY"] = api_key
@@ -53,8 +59,8 @@ def load_model() -> LLM:
 {{/if}}
 {{#if (eq modelProvider "OpenAI")}}
 import os
-from crewai import LLM
 from bedrock_agentcore.identity.auth import requires_api_key
+from model.credentials import CredentialCache
 
 IDENTITY_PROVIDER_NAME = "{{identityProviders.[0].name}}"
 IDENTITY_ENV_VAR = "{{identityProviders.[0].envVarName}}"
@@ -66,6 +72,10 @@ def _agentcore_identity_api_key_provider(api_key: str) -> str:
     return api_key
 
 
+# Fetched once for the process and refreshed before it expires, see model/credentials.py
+_api_key_cache = CredentialCache(IDENTITY_PROVIDER_NAME, _agentcore_identity_api_key_provider)
+
+
 def _get_api_key() -> str:
     """
     Uses AgentCore Identity for API key management in deployed environments.
@@ -78,11 +88,11 @@ def _get_api_key() -> str:
                 f"{IDENTITY_ENV_VAR} not found. Add {IDENTITY_ENV_VAR}=your-key to .env.local"
             )
         return api_key
-    return _agentcore_identity_api_key_provider()
+    return _api_key_cache.get()
 
 
-def load_model() -> LLM:
-    """Get authenticated OpenAI model client."""
+def _create_model() -> LLM:
+    """Create an authenticated OpenAI model client."""
     api_key = _get_api_key()
     # CrewAI requires OPENAI_API_KEY env var (ignores api_key parameter)
     os.environ["OPENAI_API_KEY"] = api_key
@@ -93,8 +103,8 @@ def load_model() -> LLM:
 {{/if}}
 {{#if (eq modelProvider "Gemini")}}
 import os
-from crewai import LLM
 from bedrock_agentcore.identity.auth import requires_api_key
+from model.credentials import CredentialCache
 
 IDENTITY_PROVIDER_NAME = "{{identityProviders.[0].name}}"
 IDENTITY_ENV_VAR = "{{identityProviders.[0].envVarName}}"
@@ -106,6 +116,10 @@ def _agentcore_identity_api_key_provider(api_key: str) -> str:
     return api_key
 
 
+# Fetched once for the process and refreshed before it expires, see model/credentials.py
+_api_key_cache = CredentialCache(IDENTITY_PROVIDER_NAME, _agentcore_identity_api_key_provider)
+
+
 def _get_api_key() -> str:
     """
     Uses AgentCore Identity for API key management in deployed environments.
@@ -118,11 +132,11 @@ def _get_api_key() -> str:
                 f"{IDENTITY_ENV_VAR} not found. Add {IDENTITY_ENV_VAR}=your-key to .env.local"
             )
         return api_key
-    return _agentcore_identity_api_key_provider()
+    return _api_key_cache.get()
 
 
-def load_model() -> LLM:
-    """Get authenticated Gemini model client."""
+def _create_model() -> LLM:
+    """Create an authenticated Gemini model client."""
     api_key = _get_api_key()
     # CrewAI requires GEMINI_API_KEY env var (ignores api_key parameter)
     os.environ["GEMINI_API_KEY"] = api_key
@@ -131,3 +145,28 @@ def load_model() -> LLM:
         api_key=api_key
     )
 {{/if}}
+
+
+_model = None
+_model_api_key = None
+_model_lock = threading.Lock()
+
+
+def load_model() -> LLM:
+    """
+    Return the process-wide LLM, creating it on first use.
+    Every crew shares it, so the API key is fetched and its client set up only once.
+    """
+    global _model, _model_api_key
+{{#if (eq modelProvider "Bedrock")}}
+    api_key = None
+{{else}}
+    # Served from the credential cache; a rotated key gets a new client
+    api_key = _get_api_key()
+{{/if}}
+    if _model is None or api_key != _model_api_key:
+        with _model_lock:
+            if _model is None or api_key != _model_api_key:
+                _model = _create_model()
+                _model_api_key = api_key
+    return _model
@@ -0,0 +1,108 @@
+import asyncio
+import contextvars
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from opentelemetry import metrics
+
+logger = logging.getLogger(__name__)
+meter = metrics.get_meter(__name__)
+
+# Crew runs that execute at the same time, each on its own worker thread
+MAX_WORKERS = int(os.getenv("CREW_MAX_WORKERS", "8"))
+# Requests that may wait for a free worker before new ones are rejected.
+# 0 rejects a request as soon as every worker is busy, a negative value queues without limit.
+_max_queued = int(os.getenv("CREW_MAX_QUEUED", "32"))
+MAX_QUEUED = _max_queued if _max_queued >= 0 else None
+
+_queue_depth = meter.create_up_down_counter("crew_pool.queue_depth", description="Crew runs waiting for a free worker")
+_running = meter.create_up_down_counter("crew_pool.running", description="Crew runs executing on a worker")
+_wait_time = meter.create_histogram(
+    "crew_pool.wait_time",
+    unit="s",
+    description="Time a crew run waited for a free worker",
+)
+_rejections = meter.create_counter("crew_pool.rejections", description="Crew runs rejected because the pool was full")
+
+
+class PoolSaturatedError(RuntimeError):
+    """Raised when every worker is busy and the wait queue is full."""
+
+
+class WorkerPool:
+    """
+    Bounded thread pool for blocking crew runs.
+
+    Each run executes on one of max_workers threads, so the event loop stays free to accept
+    and answer other requests. Runs beyond that wait in a queue of up to max_queued; once the
+    queue is full, new runs are rejected with PoolSaturatedError instead of piling up.
+    """
+
+    def __init__(self, max_workers: int = MAX_WORKERS, max_queued: Optional[int] = MAX_QUEUED):
+        self.max_workers = max(1, max_workers)
+        self.max_queued = max_queued
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="crew")
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run func on a worker thread and wait for its result."""
+        with self._lock:
+            if self.max_queued is not None and self._queued + self._running >= self.max_workers + self.max_queued:
+                _rejections.add(1)
+                raise PoolSaturatedError(
+                    f"All {self.max_workers} workers are busy and {self._queued} requests are already waiting"
+                )
+            self._queued += 1
+        _queue_depth.add(1)
+
+        # Runs in the request's context so AgentCore Identity and tracing see the same request
+        context = contextvars.copy_context()
+        submitted = time.monotonic()
+
+        def work():
+            self._start(submitted)
+            try:
+                return context.run(func, *args, **kwargs)
+            finally:
+                with self._lock:
+                    self._running -= 1
+                _running.add(-1)
+
+        future = self._executor.submit(work)
+        future.add_done_callback(self._on_done)
+        # Cancelling the request cancels a run that has not started; one already running finishes
+        return await asyncio.wrap_future(future)
+
+    def stats(self) -> dict:
+        """Current pool occupancy, e.g. for logging or a health endpoint."""
+        with self._lock:
+            return {
+                "running": self._running,
+                "queued": self._queued,
+                "max_workers": self.max_workers,
+                "max_queued": self.max_queued,
+            }
+
+    def _start(self, submitted: float) -> None:
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+        _queue_depth.add(-1)
+        _running.add(1)
+        waited = time.monotonic() - submitted
+        _wait_time.record(waited)
+        if waited > 1:
+            logger.info("Crew run waited %.2fs for a free worker", waited)
+
+    def _on_done(self, future: Future) -> None:
+        if future.cancelled():
+            # The run never started, so it still counts as queued
+            with self._lock:
+                self._queued -= 1
+            _queue_depth.add(-1)
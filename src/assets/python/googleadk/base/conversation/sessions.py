@@ -0,0 +1,108 @@
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict
+
+from google.adk.sessions import BaseSessionService, InMemorySessionService, Session
+from opentelemetry import metrics
+
+logger = logging.getLogger(__name__)
+meter = metrics.get_meter(__name__)
+
+# SQLAlchemy URL of a database to store sessions in, such as sqlite+aiosqlite:///sessions.db.
+# Unset keeps sessions in this process.
+SESSION_DATABASE_URL = os.getenv("SESSION_DATABASE_URL", "")
+# Bounds for sessions kept in this process
+MAX_SESSIONS = int(os.getenv("SESSION_MAX_ENTRIES", "256"))
+IDLE_TTL_SECONDS = float(os.getenv("SESSION_IDLE_TTL_SECONDS", "900"))
+
+_evictions = meter.create_counter("sessions.evictions", description="In-process sessions evicted as idle or least recently used")
+
+
+class LRUInMemorySessionService(InMemorySessionService):
+    """
+    InMemorySessionService that keeps at most max_sessions sessions.
+    Sessions idle for longer than idle_ttl seconds, then the least recently used ones, are
+    deleted as sessions are used, so memory stays bounded.
+    """
+
+    def __init__(self, max_sessions: int = MAX_SESSIONS, idle_ttl: float = IDLE_TTL_SECONDS):
+        super().__init__()
+        self.max_sessions = max(1, max_sessions)
+        self.idle_ttl = idle_ttl
+        self._last_used: OrderedDict[tuple[str, str, str], float] = OrderedDict()
+
+    async def create_session(self, **kwargs) -> Session:
+        session = await super().create_session(**kwargs)
+        await self._touch(session)
+        return session
+
+    async def get_session(self, **kwargs) -> Session | None:
+        session = await super().get_session(**kwargs)
+        if session is not None:
+            await self._touch(session)
+        return session
+
+    async def append_event(self, session, event):
+        event = await super().append_event(session, event)
+        # A session that is being run is in use even if nothing looked it up recently. Eviction
+        # walks the dict from the front, so it must also move to the most recently used end.
+        key = (session.app_name, session.user_id, session.id)
+        if key in self._last_used:
+            self._last_used[key] = time.monotonic()
+            self._last_used.move_to_end(key)
+        return event
+
+    async def delete_session(self, *, app_name: str, user_id: str, session_id: str) -> None:
+        await super().delete_session(app_name=app_name, user_id=user_id, session_id=session_id)
+        self._last_used.pop((app_name, user_id, session_id), None)
+
+    async def _touch(self, session: Session) -> None:
+        key = (session.app_name, session.user_id, session.id)
+        now = time.monotonic()
+        self._last_used[key] = now
+        self._last_used.move_to_end(key)
+        while self._last_used:
+            oldest, used = next(iter(self._last_used.items()))
+            if len(self._last_used) <= self.max_sessions and now - used <= self.idle_ttl:
+                break
+            app_name, user_id, session_id = oldest
+            await self.delete_session(app_name=app_name, user_id=user_id, session_id=session_id)
+            _evictions.add(1)
+            logger.debug("Evicted session %s", session_id)
+
+
+_session_service = None
+_create_lock = asyncio.Lock()
+
+
+def get_session_service() -> BaseSessionService:
+    """Returns the process-wide session service, shared by every request."""
+    global _session_service
+    if _session_service is None:
+        if SESSION_DATABASE_URL:
+            # Imported here because it needs SQLAlchemy, which only the database backend uses
+            from google.adk.sessions import DatabaseSessionService
+
+            _session_service = DatabaseSessionService(db_url=SESSION_DATABASE_URL)
+            logger.info("Storing sessions in %s", SESSION_DATABASE_URL.split("://")[0])
+        else:
+            _session_service = LRUInMemorySessionService()
+    return _session_service
+
+
+async def get_or_create_session(app_name: str, user_id: str, session_id: str | None) -> Session:
+    """Returns the stored session for (user_id, session_id), creating it on its first turn."""
+    service = get_session_service()
+    if session_id:
+        session = await service.get_session(app_name=app_name, user_id=user_id, session_id=session_id)
+        if session is not None:
+            return session
+    # Concurrent first turns of one session must not both create it
+    async with _create_lock:
+        if session_id:
+            session = await service.get_session(app_name=app_name, user_id=user_id, session_id=session_id)
+            if session is not None:
+                return session
+        return await service.create_session(app_name=app_name, user_id=user_id, session_id=session_id)
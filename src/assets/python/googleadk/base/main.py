@@ -1,10 +1,12 @@
 import os
+import uuid
 from google.adk.agents import Agent
+from google.adk.agents.run_config import RunConfig, StreamingMode
 from google.adk.runners import Runner
-from google.adk.sessions import InMemorySessionService
 from google.genai import types
 from bedrock_agentcore.runtime import BedrockAgentCoreApp
 from model.load import load_model
+from conversation.sessions import get_or_create_session, get_session_service
 {{#if hasGateway}}
 from mcp_client.client import get_all_gateway_mcp_toolsets
 {{else}}
@@ -16,8 +18,8 @@ log = app.logger
 
 APP_NAME = "{{ name }}"
 
-# https://google.github.io/adk-docs/agents/models/
-MODEL_ID = "gemini-2.5-flash"
+# Set to 1, or send "stream": true in the payload, to stream tokens as they are generated
+STREAM_RESPONSES = os.getenv("STREAM_RESPONSES") == "1"
 
 
 # Define a simple function tool
@@ -34,34 +36,40 @@ mcp_client = get_streamable_http_mcp_client()
 mcp_toolset = [mcp_client] if mcp_client else []
 {{/if}}
 
-_credentials_loaded = False
+_agent = None
 
-def ensure_credentials_loaded():
-    global _credentials_loaded
-    if not _credentials_loaded:
-        load_model()
-        _credentials_loaded = True
+def get_or_create_agent():
+    global _agent
+    model = load_model()
+    # A rotated API key comes with a new model
+    if _agent is None or _agent.model is not model:
+        # Agent Definition
+        _agent = Agent(
+            model=model,
+            name="{{ name }}",
+            description="Agent to answer questions",
+            instruction="I can answer your questions using the knowledge I have!",
+            tools=mcp_toolset + [add_numbers],
+        )
+    return _agent
 
 
-# Agent Definition
-agent = Agent(
-    model=MODEL_ID,
-    name="{{ name }}",
-    description="Agent to answer questions",
-    instruction="I can answer your questions using the knowledge I have!",
-    tools=mcp_toolset + [add_numbers],
-)
+_runner = None
+
+def get_or_create_runner():
+    global _runner
+    agent = get_or_create_agent()
+    if _runner is None or _runner.agent is not agent:
+        # One runner and session service serve every request, see conversation/sessions.py
+        _runner = Runner(agent=agent, app_name=APP_NAME, session_service=get_session_service())
+    return _runner
 
 
 # Session and Runner
 async def setup_session_and_runner(user_id, session_id):
-    ensure_credentials_loaded()
-    session_service = InMemorySessionService()
-    session = await session_service.create_session(
-        app_name=APP_NAME, user_id=user_id, session_id=session_id
-    )
-    runner = Runner(agent=agent, app_name=APP_NAME, session_service=session_service)
-    return session, runner
+    # Later turns of a session continue its stored conversation
+    session = await get_or_create_session(APP_NAME, user_id, session_id)
+    return session, get_or_create_runner()
 
 
 # Agent Interaction
@@ -80,15 +88,51 @@ async def call_agent_async(query, user_id, session_id):
     return final_response
 
 
+async def stream_agent_async(query, user_id, session_id):
+    """Yields model tokens as text and tool progress as {"event": ...} objects."""
+    content = types.Content(role="user", parts=[types.Part(text=query)])
+    session, runner = await setup_session_and_runner(user_id, session_id)
+    events = runner.run_async(
+        user_id=user_id,
+        session_id=session.id,
+        new_message=content,
+        run_config=RunConfig(streaming_mode=StreamingMode.SSE),
+    )
+
+    streamed = False
+    async for event in events:
+        parts = event.content.parts if event.content and event.content.parts else []
+        text = "".join(part.text for part in parts if part.text and not part.thought)
+        if event.partial:
+            if text:
+                streamed = True
+                yield text
+            continue
+        # The complete response follows its partial chunks; send it only if nothing was streamed
+        if text and not streamed:
+            yield text
+        streamed = False
+        for call in event.get_function_calls():
+            yield {"event": "tool_call", "name": call.name}
+        for response in event.get_function_responses():
+            status = "error" if "error" in (response.response or {}) else "success"
+            yield {"event": "tool_result", "name": response.name, "status": status}
+
+
 @app.entrypoint
 async def invoke(payload, context):
     log.info("Invoking Agent.....")
 
     # Process the user prompt
     prompt = payload.get("prompt", "What can you help me with?")
-    session_id = getattr(context, "session_id", "default_session")
+    # Requests without a runtime session id each get a new conversation instead of sharing one
+    session_id = getattr(context, "session_id", None) or str(uuid.uuid4())
     user_id = payload.get("user_id", "default_user")
 
+    if payload.get("stream", STREAM_RESPONSES):
+        # Returning an async generator streams each item to the client as a server-sent event
+        return stream_agent_async(prompt, user_id, session_id)
+
     # Run the agent
     result = await call_agent_async(prompt, user_id, session_id)
 
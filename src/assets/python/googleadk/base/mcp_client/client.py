@@ -6,12 +6,13 @@ from google.adk.tools.mcp_tool.mcp_session_manager import StreamableHTTPConnecti
 logger = logging.getLogger(__name__)
 
 {{#if hasGateway}}
-{{#if (includes gatewayAuthTypes "AWS_IAM")}}
 import httpx
-from mcp_proxy_for_aws.sigv4_helper import SigV4HTTPXAuth, create_aws_session
+{{#if (includes gatewayAuthTypes "AWS_IAM")}}
+from mcp_client.auth import get_sigv4_auth
 {{/if}}
 {{#if (includes gatewayAuthTypes "CUSTOM_JWT")}}
 from bedrock_agentcore.identity import requires_access_token
+from mcp_client.auth import BearerTokenAuth
 {{/if}}
 
 {{#each gatewayProviders}}
@@ -25,6 +26,10 @@ def _get_bearer_token_{{snakeCase name}}(*, access_token: str):
     """Obtain OAuth access token via AgentCore Identity for {{name}}."""
     return access_token
 
+
+# Caches the token and refreshes it before it expires, see mcp_client/auth.py
+_auth_{{snakeCase name}} = BearerTokenAuth("{{name}}", _get_bearer_token_{{snakeCase name}})
+
 {{/if}}
 {{/each}}
 
@@ -35,16 +40,16 @@ def get_all_gateway_mcp_toolsets() -> list[MCPToolset]:
     url = os.environ.get("{{envVarName}}")
     if url:
         {{#if (eq authType "AWS_IAM")}}
-        session = create_aws_session()
-        auth = SigV4HTTPXAuth(session.get_credentials(), "bedrock-agentcore", session.region_name)
+        # Shared signer, so connecting never resolves AWS credentials again, see mcp_client/auth.py
         toolsets.append(MCPToolset(connection_params=StreamableHTTPConnectionParams(
             url=url,
-            httpx_client_factory=lambda **kwargs: httpx.AsyncClient(auth=auth, **kwargs)
+            httpx_client_factory=lambda **kwargs: httpx.AsyncClient(**{**kwargs, "auth": get_sigv4_auth()})
         )))
         {{else if (eq authType "CUSTOM_JWT")}}
-        token = _get_bearer_token_{{snakeCase name}}()
-        headers = {"Authorization": f"Bearer {token}"} if token else None
-        toolsets.append(MCPToolset(connection_params=StreamableHTTPConnectionParams(url=url, headers=headers)))
+        toolsets.append(MCPToolset(connection_params=StreamableHTTPConnectionParams(
+            url=url,
+            httpx_client_factory=lambda **kwargs: httpx.AsyncClient(**{**kwargs, "auth": _auth_{{snakeCase name}}})
+        )))
         {{else}}
         toolsets.append(MCPToolset(connection_params=StreamableHTTPConnectionParams(url=url)))
         {{/if}}
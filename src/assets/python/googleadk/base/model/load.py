@@ -1,9 +1,15 @@
 import os
+import threading
+from google.adk.models.google_llm import Gemini
 from bedrock_agentcore.identity.auth import requires_api_key
+from model.credentials import CredentialCache
 
 IDENTITY_PROVIDER_NAME = "{{identityProviders.[0].name}}"
 IDENTITY_ENV_VAR = "{{identityProviders.[0].envVarName}}"
 
+# https://google.github.io/adk-docs/agents/models/
+MODEL_ID = "gemini-2.5-flash"
+
 
 @requires_api_key(provider_name=IDENTITY_PROVIDER_NAME)
 def _agentcore_identity_api_key_provider(api_key: str) -> str:
@@ -11,6 +17,10 @@ def _agentcore_identity_api_key_provider(api_key: str) -> str:
     return api_key
 
 
+# Fetched once for the process and refreshed before it expires, see model/credentials.py
+_api_key_cache = CredentialCache(IDENTITY_PROVIDER_NAME, _agentcore_identity_api_key_provider)
+
+
 def _get_api_key() -> str:
     """
     Uses AgentCore Identity for API key management in deployed environments.
@@ -23,19 +33,34 @@ def _get_api_key() -> str:
                 f"{IDENTITY_ENV_VAR} not found. Add {IDENTITY_ENV_VAR}=your-key to .env.local"
             )
         return api_key
-    return _agentcore_identity_api_key_provider()
+    return _api_key_cache.get()
+
+
+_model = None
+_model_api_key = None
+_model_lock = threading.Lock()
 
 
-def load_model() -> None:
+def load_model() -> Gemini:
     """
-    Set up Gemini API key authentication.
+    Set up Gemini API key authentication and return the process-wide Gemini model.
     Uses AgentCore Identity for API key management in deployed environments,
     and falls back to .env file for local development.
-    Sets the GOOGLE_API_KEY environment variable for the Google ADK.
+    The model is created once and shared by every request, so its Gemini API client
+    and connection pool are reused instead of being rebuilt per invocation. It is created
+    again when the API key is rotated.
     """
+    global _model, _model_api_key
+    # Served from the credential cache
     api_key = _get_api_key()
-    # Use Google AI Studios API Key Authentication.
-    # https://google.github.io/adk-docs/agents/models/#google-ai-studio
-    os.environ["GOOGLE_API_KEY"] = api_key
-    # Set to TRUE is using Google Vertex AI, Set to FALSE for Google AI Studio
-    os.environ["GOOGLE_GENAI_USE_VERTEXAI"] = "FALSE"
+    if _model is None or api_key != _model_api_key:
+        with _model_lock:
+            if _model is None or api_key != _model_api_key:
+                # Use Google AI Studios API Key Authentication.
+                # https://google.github.io/adk-docs/agents/models/#google-ai-studio
+                os.environ["GOOGLE_API_KEY"] = api_key
+                # Set to TRUE is using Google Vertex AI, Set to FALSE for Google AI Studio
+                os.environ["GOOGLE_GENAI_USE_VERTEXAI"] = "FALSE"
+                _model = Gemini(model=MODEL_ID)
+                _model_api_key = api_key
+    return _model
@@ -0,0 +1,71 @@
+"""
+Micro-benchmark of per-request agent overhead with and without reusing the compiled graph.
+
+Compares building the graph with create_react_agent on every request, as the template did
+before, with get_or_create_graph from main.py, which reuses it while the model and tools stay
+the same. The model is a fake chat model, so only the agent's own overhead is measured, and
+the MCP tools are stand-ins with the same shape as the tools listed from an MCP server.
+
+Run from the agent root: python -m benchmarks.graph_reuse --requests 200 --tools 20
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.messages import HumanMessage
+from langchain_core.tools import StructuredTool
+from langgraph.prebuilt import create_react_agent
+
+import main
+from model.load import system_prompt
+
+
+class FakeModel(FakeListChatModel):
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+
+def mcp_tool(index: int) -> StructuredTool:
+    def lookup(query: str, limit: int = 10) -> str:
+        return query
+
+    return StructuredTool.from_function(lookup, name=f"lookup_{index}", description=f"Look up records in table {index}")
+
+
+async def measure(name: str, get_graph, requests: int) -> None:
+    build, total = [], []
+    for _ in range(requests):
+        started = time.perf_counter()
+        graph = get_graph()
+        built = time.perf_counter()
+        await graph.ainvoke({"messages": [HumanMessage(content="hello")]})
+        build.append(built - started)
+        total.append(time.perf_counter() - started)
+    print(
+        f"{name:<10} graph {statistics.median(build) * 1000:7.2f} ms"
+        f"  request {statistics.median(total) * 1000:7.2f} ms (median of {requests})"
+    )
+
+
+async def run(requests: int, tool_count: int) -> None:
+    model = FakeModel(responses=["Hello!"])
+    # get_or_create_graph loads the model itself, use the fake one instead of a provider
+    main.load_model = lambda: model
+    mcp_tools = [mcp_tool(i) for i in range(tool_count)]
+
+    def rebuild():
+        return create_react_agent(model, tools=mcp_tools + main.tools, prompt=system_prompt(main.SYSTEM_PROMPT))
+
+    await measure("rebuild", rebuild, requests)
+    await measure("reuse", lambda: main.get_or_create_graph(mcp_tools), requests)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--tools", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(run(args.requests, args.tools))
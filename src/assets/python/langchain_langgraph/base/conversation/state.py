@@ -0,0 +1,105 @@
+import asyncio
+import logging
+import os
+import threading
+from collections import OrderedDict
+
+import aiosqlite
+from langchain_core.messages import HumanMessage, trim_messages
+from langchain_core.messages.utils import count_tokens_approximately
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+logger = logging.getLogger(__name__)
+
+# "memory" keeps conversations in this process, "sqlite" stores them in CHECKPOINT_SQLITE_PATH.
+# Unset sends every request to the model on its own, as a single message.
+CHECKPOINT_BACKEND = os.getenv("CHECKPOINT_BACKEND", "").lower()
+# Most recently used conversations kept by the in-process backend
+CHECKPOINT_MAX_THREADS = int(os.getenv("CHECKPOINT_MAX_THREADS", "256"))
+CHECKPOINT_SQLITE_PATH = os.getenv("CHECKPOINT_SQLITE_PATH", "checkpoints.sqlite")
+# Approximate token budget of conversation history sent to the model each turn, 0 sends all of it
+HISTORY_MAX_TOKENS = int(os.getenv("HISTORY_MAX_TOKENS", "8000"))
+
+
+class LRUInMemorySaver(InMemorySaver):
+    """
+    InMemorySaver that keeps only the max_threads most recently used conversations.
+    Older conversations are deleted as new ones are saved, so memory stays bounded.
+    """
+
+    def __init__(self, max_threads: int = CHECKPOINT_MAX_THREADS):
+        super().__init__()
+        self.max_threads = max(1, max_threads)
+        self._recent: OrderedDict[str, None] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_tuple(self, config):
+        thread_id = config["configurable"]["thread_id"]
+        with self._lock:
+            if thread_id in self._recent:
+                self._recent.move_to_end(thread_id)
+        return super().get_tuple(config)
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        result = super().put(config, checkpoint, metadata, new_versions)
+        thread_id = config["configurable"]["thread_id"]
+        with self._lock:
+            self._recent[thread_id] = None
+            self._recent.move_to_end(thread_id)
+            evicted = []
+            while len(self._recent) > self.max_threads:
+                evicted.append(self._recent.popitem(last=False)[0])
+            for evicted_id in evicted:
+                self.delete_thread(evicted_id)
+        return result
+
+
+async def _create_checkpointer(backend: str) -> BaseCheckpointSaver:
+    if backend == "memory":
+        return LRUInMemorySaver()
+    if backend == "sqlite":
+        # Local durable store; replace with another saver, such as AsyncPostgresSaver, to share
+        # conversations across runtime instances
+        return AsyncSqliteSaver(await aiosqlite.connect(CHECKPOINT_SQLITE_PATH))
+    raise ValueError(f"Unknown CHECKPOINT_BACKEND {backend!r}, expected 'memory' or 'sqlite'")
+
+
+_checkpointer = None
+_checkpointer_lock = asyncio.Lock()
+
+
+async def get_checkpointer() -> BaseCheckpointSaver | None:
+    """Returns the process-wide checkpointer, or None when CHECKPOINT_BACKEND is unset."""
+    global _checkpointer
+    if _checkpointer is None and CHECKPOINT_BACKEND:
+        async with _checkpointer_lock:
+            if _checkpointer is None:
+                _checkpointer = await _create_checkpointer(CHECKPOINT_BACKEND)
+                logger.info("Storing conversations with the %s checkpointer", CHECKPOINT_BACKEND)
+    return _checkpointer
+
+
+def trim_history(state) -> dict:
+    """
+    pre_model_hook that sends the model only the latest HISTORY_MAX_TOKENS of the conversation,
+    so input size per turn stays flat as the stored conversation grows.
+    """
+    messages = state["messages"]
+    if HISTORY_MAX_TOKENS <= 0:
+        return {"llm_input_messages": messages}
+    trimmed = trim_messages(
+        messages,
+        strategy="last",
+        token_counter=count_tokens_approximately,
+        max_tokens=HISTORY_MAX_TOKENS,
+        # Starting on a human message never separates a tool result from its tool call
+        start_on="human",
+        include_system=True,
+    )
+    if not trimmed:
+        # The current turn alone is over budget, send it whole rather than nothing
+        last_human = max(i for i, message in enumerate(messages) if isinstance(message, HumanMessage))
+        trimmed = messages[last_human:]
+    return {"llm_input_messages": trimmed}
@@ -1,26 +1,20 @@
+import hashlib
+import json
 import os
-from langchain_core.messages import HumanMessage
+import uuid
+from langchain_core.messages import AIMessageChunk, HumanMessage, ToolMessage
 from langgraph.prebuilt import create_react_agent
 from langchain.tools import tool
 from bedrock_agentcore.runtime import BedrockAgentCoreApp
-from model.load import load_model
-{{#if hasGateway}}
-from mcp_client.client import get_all_gateway_mcp_client
-{{else}}
-from mcp_client.client import get_streamable_http_mcp_client
-{{/if}}
+from model.load import load_model, system_prompt
+from conversation.state import get_checkpointer, trim_history
+from mcp_client.client import get_mcp_tools
 
 app = BedrockAgentCoreApp()
 log = app.logger
 
-_llm = None
-
-def get_or_create_model():
-    global _llm
-    if _llm is None:
-        _llm = load_model()
-    return _llm
-
+# Set to 1, or send "stream": true in the payload, to stream tokens as they are generated
+STREAM_RESPONSES = os.getenv("STREAM_RESPONSES") == "1"
 
 # Define a simple function tool
 @tool
@@ -32,31 +26,86 @@ def add_numbers(a: int, b: int) -> int:
 # Define a collection of tools used by the model
 tools = [add_numbers]
 
+SYSTEM_PROMPT = "You are a helpful assistant. Use tools when appropriate."
+
+_graph = None
+_graph_mcp_tools = None
+_graph_tools_digest = None
+_graph_fingerprint = None
+
+
+def _tools_digest(all_tools) -> str:
+    """Identifies the name, description and schema of every tool."""
+    schemas = [(t.name, t.description, t.args) for t in all_tools]
+    payload = json.dumps(schemas, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def get_or_create_graph(mcp_tools, checkpointer=None):
+    """Returns the compiled agent graph, rebuilding it only when the model or tool set changes."""
+    global _graph, _graph_mcp_tools, _graph_tools_digest, _graph_fingerprint
+    # Loaded on every request, so a model recreated for a rotated API key is picked up right away
+    model = load_model()
+    all_tools = mcp_tools + tools
+    # The tool cache hands out the same list until it re-lists, so schemas are only hashed then
+    if mcp_tools is not _graph_mcp_tools:
+        _graph_tools_digest = _tools_digest(all_tools)
+        _graph_mcp_tools = mcp_tools
+    # The graph keeps its model alive, so a new model never reuses the old one's id
+    fingerprint = (id(model), _graph_tools_digest)
+    if fingerprint != _graph_fingerprint:
+        log.info(f"Building agent graph with {len(all_tools)} tools")
+        _graph = create_react_agent(
+            model,
+            tools=all_tools,
+            prompt=system_prompt(SYSTEM_PROMPT),
+            checkpointer=checkpointer,
+            # Stored conversations are trimmed to a token budget before each model call
+            pre_model_hook=trim_history if checkpointer else None,
+        )
+        _graph_fingerprint = fingerprint
+    return _graph
+
+async def stream_graph(graph, messages, config):
+    """Yields model tokens as text and tool progress as {"event": ...} objects."""
+    async for chunk, _ in graph.astream({"messages": messages}, config, stream_mode="messages"):
+        if isinstance(chunk, AIMessageChunk):
+            for tool_call in chunk.tool_call_chunks:
+                # Only the first chunk of each tool call carries its name
+                if tool_call.get("name"):
+                    yield {"event": "tool_call", "name": tool_call["name"]}
+            if chunk.text:
+                yield chunk.text
+        elif isinstance(chunk, ToolMessage):
+            yield {"event": "tool_result", "name": chunk.name, "status": chunk.status}
+
 
 @app.entrypoint
 async def invoke(payload, context):
     log.info("Invoking Agent.....")
 
-    # Get MCP Client
-    {{#if hasGateway}}
-    mcp_client = get_all_gateway_mcp_client()
-    {{else}}
-    mcp_client = get_streamable_http_mcp_client()
-    {{/if}}
+    # Load MCP Tools, cached across invocations (see mcp_client/client.py)
+    mcp_tools = await get_mcp_tools()
 
-    # Load MCP Tools
-    mcp_tools = []
-    if mcp_client:
-        mcp_tools = await mcp_client.get_tools()
+    # Reuse the agent graph compiled by create_react_agent
+    checkpointer = await get_checkpointer()
+    graph = get_or_create_graph(mcp_tools, checkpointer)
 
-    # Define the agent using create_react_agent
-    graph = create_react_agent(get_or_create_model(), tools=mcp_tools + tools)
+    # With a checkpointer, earlier turns of this runtime session are restored from its thread
+    session_id = getattr(context, "session_id", None) or str(uuid.uuid4())
+    config = {"configurable": {"thread_id": session_id}}
 
     # Process the user prompt
     prompt = payload.get("prompt", "What can you help me with?")
 
+    messages = [HumanMessage(content=prompt)]
+
+    if payload.get("stream", STREAM_RESPONSES):
+        # The runtime sends a returned async generator as server-sent events
+        return stream_graph(graph, messages, config)
+
     # Run the agent
-    result = await graph.ainvoke({"messages": [HumanMessage(content=prompt)]})
+    result = await graph.ainvoke({"messages": messages}, config)
 
     # Return result
     return {"result": result["messages"][-1].content}
@@ -1,15 +1,21 @@
+import asyncio
 import os
 import logging
+import time
+from typing import Awaitable, Callable
+from langchain_core.tools import BaseTool
 from langchain_mcp_adapters.client import MultiServerMCPClient
+from mcp_client.pool import MCPSessionPool
 
 logger = logging.getLogger(__name__)
 
 {{#if hasGateway}}
 {{#if (includes gatewayAuthTypes "AWS_IAM")}}
-from mcp_proxy_for_aws.sigv4_helper import SigV4HTTPXAuth, create_aws_session
+from mcp_client.auth import get_sigv4_auth
 {{/if}}
 {{#if (includes gatewayAuthTypes "CUSTOM_JWT")}}
 from bedrock_agentcore.identity import requires_access_token
+from mcp_client.auth import BearerTokenAuth
 {{/if}}
 
 {{#each gatewayProviders}}
@@ -23,6 +29,10 @@ def _get_bearer_token_{{snakeCase name}}(*, access_token: str):
     """Obtain OAuth access token via AgentCore Identity for {{name}}."""
     return access_token
 
+
+# Caches the token and refreshes it before it expires, see mcp_client/auth.py
+_auth_{{snakeCase name}} = BearerTokenAuth("{{name}}", _get_bearer_token_{{snakeCase name}})
+
 {{/if}}
 {{/each}}
 
@@ -33,13 +43,10 @@ def get_all_gateway_mcp_client() -> MultiServerMCPClient | None:
     url = os.environ.get("{{envVarName}}")
     if url:
         {{#if (eq authType "AWS_IAM")}}
-        session = create_aws_session()
-        auth = SigV4HTTPXAuth(session.get_credentials(), "bedrock-agentcore", session.region_name)
-        servers["{{name}}"] = {"transport": "streamable_http", "url": url, "auth": auth}
+        # Shared signer, so connecting never resolves AWS credentials again, see mcp_client/auth.py
+        servers["{{name}}"] = {"transport": "streamable_http", "url": url, "auth": get_sigv4_auth()}
         {{else if (eq authType "CUSTOM_JWT")}}
-        token = _get_bearer_token_{{snakeCase name}}()
-        headers = {"Authorization": f"Bearer {token}"} if token else None
-        servers["{{name}}"] = {"transport": "streamable_http", "url": url, "headers": headers}
+        servers["{{name}}"] = {"transport": "streamable_http", "url": url, "auth": _auth_{{snakeCase name}}}
         {{else}}
         servers["{{name}}"] = {"transport": "streamable_http", "url": url}
         {{/if}}
@@ -66,3 +73,76 @@ def get_streamable_http_mcp_client() -> MultiServerMCPClient:
         }
     )
 {{/if}}
+
+
+# Seconds listed MCP tools are reused before they are re-listed in the background, 0 lists on every call
+TOOLS_CACHE_TTL_SECONDS = float(os.getenv("MCP_TOOLS_CACHE_TTL_SECONDS", "300"))
+
+
+class ToolsCache:
+    """
+    Caches the tools listed from MCP servers across invocations.
+
+    The first call lists the tools and waits for them. Later calls return the cached tools
+    without a network round trip; once they are older than ttl, a single background task
+    re-lists them while callers keep using the cached copy.
+    """
+
+    def __init__(self, load: Callable[[], Awaitable[list]], ttl: float = TOOLS_CACHE_TTL_SECONDS):
+        self._load = load
+        self.ttl = ttl
+        self._tools: list | None = None
+        self._loaded_at = 0.0
+        self._lock = asyncio.Lock()
+        self._refresh: asyncio.Task | None = None
+
+    async def get(self) -> list:
+        if self.ttl <= 0:
+            return await self._load()
+        if self._tools is None:
+            # Concurrent cold requests share a single listing
+            async with self._lock:
+                if self._tools is None:
+                    self._tools = await self._load()
+                    self._loaded_at = time.monotonic()
+        elif self._refresh is None and time.monotonic() - self._loaded_at > self.ttl:
+            # The task copies this request's context, so gateway credentials resolve as they do inline
+            self._refresh = asyncio.create_task(self._refresh_tools())
+        return self._tools
+
+    def invalidate(self) -> None:
+        """Re-list the tools on the next call, e.g. after the server reports that its tools changed."""
+        self._loaded_at = float("-inf")
+
+    async def _refresh_tools(self) -> None:
+        try:
+            self._tools = await self._load()
+        except Exception:
+            logger.warning("Failed to refresh MCP tools, keeping the cached tools", exc_info=True)
+        finally:
+            # A failed refresh is retried after another TTL rather than on every request
+            self._loaded_at = time.monotonic()
+            self._refresh = None
+
+
+def _mcp_connections() -> dict:
+    {{#if hasGateway}}
+    mcp_client = get_all_gateway_mcp_client()
+    {{else}}
+    mcp_client = get_streamable_http_mcp_client()
+    {{/if}}
+    return mcp_client.connections if mcp_client else {}
+
+
+# Long-lived sessions shared by all invocations, see mcp_client/pool.py
+_session_pool = MCPSessionPool(_mcp_connections, on_tools_changed=lambda: _tools_cache.invalidate())
+# Shared by all invocations so steady-state requests make no tool-listing calls
+_tools_cache = ToolsCache(_session_pool.get_tools)
+
+
+async def get_mcp_tools() -> list[BaseTool]:
+    """
+    Returns the MCP tools, listing them from the servers only when the cache needs it.
+    Tool calls go over the pooled sessions, so a request only reaches the network to call tools.
+    """
+    return await _tools_cache.get()
@@ -0,0 +1,170 @@
+import asyncio
+import logging
+import os
+from typing import Any, Awaitable, Callable
+
+import anyio
+import httpx
+from langchain_core.tools import BaseTool
+from langchain_mcp_adapters.tools import load_mcp_tools
+from mcp import ClientSession
+from mcp.client.streamable_http import streamablehttp_client
+from mcp.shared.exceptions import McpError
+from mcp.types import CONNECTION_CLOSED, ServerNotification, ToolListChangedNotification
+
+logger = logging.getLogger(__name__)
+
+# Seconds between health-check pings on an idle session
+PING_INTERVAL_SECONDS = float(os.getenv("MCP_SESSION_PING_INTERVAL_SECONDS", "60"))
+# Seconds a request waits for a session to connect before failing
+CONNECT_TIMEOUT_SECONDS = float(os.getenv("MCP_SESSION_CONNECT_TIMEOUT_SECONDS", "30"))
+
+# The streamable HTTP client reports a session the server has ended with code 32600
+_SESSION_LOST_CODES = {CONNECTION_CLOSED, 32600}
+
+
+def _is_session_lost(error: Exception) -> bool:
+    if isinstance(error, McpError):
+        return error.error.code in _SESSION_LOST_CODES
+    return isinstance(error, (anyio.ClosedResourceError, anyio.BrokenResourceError, httpx.TransportError))
+
+
+def _was_not_run(error: Exception) -> bool:
+    """Whether the server cannot have run the request: it refused the session (HTTP 404) or was never reached."""
+    if isinstance(error, McpError):
+        return error.error.code == 32600
+    return isinstance(error, httpx.ConnectError)
+
+
+class PooledSession:
+    """
+    A long-lived MCP session to one server, shared by all requests.
+
+    Each connection is owned by its own task because the MCP transport must be entered and
+    exited by the same task. The task pings the server while idle and ends when the session
+    is lost; the next request then connects again, building the connection in its own
+    context so credentials are fetched as they would be inline. A tool listing whose session
+    is lost mid-call is retried once on a fresh session. A tool call is only retried when the
+    server cannot have run it, otherwise the error is raised so a tool with side effects never
+    runs twice.
+
+    Passed to load_mcp_tools in place of a ClientSession, so tools keep working across reconnects.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        connection: Callable[[], dict],
+        on_tools_changed: Callable[[], None] | None = None,
+    ):
+        self.name = name
+        self._connection = connection
+        self._on_tools_changed = on_tools_changed
+        self._session: ClientSession | None = None
+        self._opening: asyncio.Future | None = None
+        self._lost: asyncio.Event | None = None
+        self._owner: asyncio.Task | None = None
+
+    async def list_tools(self, *args, **kwargs):
+        return await self._request(lambda session: session.list_tools(*args, **kwargs), idempotent=True)
+
+    async def call_tool(self, *args, **kwargs):
+        return await self._request(lambda session: session.call_tool(*args, **kwargs), idempotent=False)
+
+    async def _request(self, send: Callable[[ClientSession], Awaitable[Any]], idempotent: bool) -> Any:
+        session = await self._get_session()
+        try:
+            return await send(session)
+        except Exception as e:
+            if not _is_session_lost(e):
+                raise
+            self._discard(session)
+            if not (idempotent or _was_not_run(e)):
+                logger.info("MCP session to %s was lost during a tool call, reconnecting on next use", self.name)
+                raise
+            logger.info("MCP session to %s was lost, reconnecting", self.name)
+            return await send(await self._get_session())
+
+    async def _get_session(self) -> ClientSession:
+        if self._session is not None:
+            return self._session
+        if self._opening is None:
+            connection = self._connection()
+            self._opening = asyncio.get_running_loop().create_future()
+            self._owner = asyncio.create_task(self._own(connection, self._opening))
+        # shield keeps one caller's timeout from cancelling the connection for everyone else
+        return await asyncio.wait_for(asyncio.shield(self._opening), CONNECT_TIMEOUT_SECONDS)
+
+    def _discard(self, session: ClientSession) -> None:
+        """Stop handing out session and let its owner task close it."""
+        if self._session is session:
+            self._session = None
+            self._opening = None
+            self._lost.set()
+
+    async def _own(self, connection: dict, opening: asyncio.Future) -> None:
+        lost = asyncio.Event()
+        try:
+            async with streamablehttp_client(
+                connection["url"],
+                headers=connection.get("headers"),
+                auth=connection.get("auth"),
+            ) as (read, write, _):
+                async with ClientSession(read, write, message_handler=self._handle_message) as session:
+                    await session.initialize()
+                    self._session = session
+                    self._lost = lost
+                    opening.set_result(session)
+                    logger.info("Connected MCP session to %s", self.name)
+                    await self._keep_alive(session, lost)
+        except Exception as e:
+            if not opening.done():
+                opening.set_exception(e)
+                # Mark the exception retrieved in case every waiting request already timed out
+                opening.exception()
+            else:
+                logger.warning("MCP session to %s ended, reconnecting on next use: %r", self.name, e)
+                logger.debug("MCP session to %s ended", self.name, exc_info=True)
+        finally:
+            if self._opening is opening:
+                self._session = None
+                self._opening = None
+
+    async def _keep_alive(self, session: ClientSession, lost: asyncio.Event) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(lost.wait(), PING_INTERVAL_SECONDS)
+                return
+            except asyncio.TimeoutError:
+                # Raises if the server is unreachable, which closes the session
+                await asyncio.wait_for(session.send_ping(), CONNECT_TIMEOUT_SECONDS)
+
+    async def _handle_message(self, message) -> None:
+        if isinstance(message, Exception):
+            logger.debug("MCP session to %s reported an error: %s", self.name, message)
+        elif isinstance(message, ServerNotification) and isinstance(message.root, ToolListChangedNotification):
+            logger.info("MCP server %s reported changed tools", self.name)
+            if self._on_tools_changed:
+                self._on_tools_changed()
+
+
+class MCPSessionPool:
+    """Long-lived MCP sessions to every configured server, created on first use."""
+
+    def __init__(self, connections: Callable[[], dict], on_tools_changed: Callable[[], None] | None = None):
+        self._connections = connections
+        self._on_tools_changed = on_tools_changed
+        self._sessions: dict[str, PooledSession] | None = None
+
+    async def get_tools(self) -> list[BaseTool]:
+        """List the tools of every server over its pooled session."""
+        if self._sessions is None:
+            self._sessions = {
+                name: PooledSession(name, self._connection_for(name), self._on_tools_changed)
+                for name in self._connections()
+            }
+        results = await asyncio.gather(*(load_mcp_tools(session) for session in self._sessions.values()))
+        return [tool for tools in results for tool in tools]
+
+    def _connection_for(self, name: str) -> Callable[[], dict]:
+        return lambda: self._connections()[name]
@@ -1,23 +1,41 @@
+import threading
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import SystemMessage
+from model.usage import CacheUsageCallback
+
 {{#if (eq modelProvider "Bedrock")}}
+import os
+from botocore.config import Config as BotocoreConfig
 from langchain_aws import ChatBedrock
 
 # Uses global inference profile for Claude Sonnet 4.5
 # https://docs.aws.amazon.com/bedrock/latest/userguide/inference-profiles-support.html
 MODEL_ID = "global.anthropic.claude-sonnet-4-5-20250929-v1:0"
 
+# Set to 1 to cache the system prompt and tool definitions, so later turns read them from the cache
+PROMPT_CACHING = os.getenv("PROMPT_CACHING") == "1"
+
+# Pool and keep alive enough connections for concurrent requests sharing the client
+BOTO_CLIENT_CONFIG = BotocoreConfig(max_pool_connections=50, tcp_keepalive=True)
 
-def load_model() -> ChatBedrock:
-    """Get Bedrock model client using IAM credentials."""
-    return ChatBedrock(model_id=MODEL_ID)
+
+def _create_model() -> ChatBedrock:
+    """Create a Bedrock model client using IAM credentials."""
+    return ChatBedrock(model_id=MODEL_ID, config=BOTO_CLIENT_CONFIG)
 {{/if}}
 {{#if (eq modelProvider "Anthropic")}}
 import os
 from langchain_anthropic import ChatAnthropic
 from bedrock_agentcore.identity.auth import requires_api_key
+from model.credentials import CredentialCache
 
 IDENTITY_PROVIDER_NAME = "{{identityProviders.[0].name}}"
 IDENTITY_ENV_VAR = "{{identityProviders.[0].envVarName}}"
 
+# Set to 1 to cache the system prompt and tool definitions, so later turns read them from the cache
+PROMPT_CACHING = os.getenv("PROMPT_CACHING") == "1"
+
 
 @requires_api_key(provider_name=IDENTITY_PROVIDER_NAME)
 def _agentcore_identity_api_key_provider(api_key: str) -> str:
@@ -25,6 +43,10 @@ def _agentcore_identity_api_key_provider(api_key: str) -> str:
     return api_key
 
 
+# Fetched once for the process and refreshed before it expires, see model/credentials.py
+_api_key_cache = CredentialCache(IDENTITY_PROVIDER_NAME, _agentcore_identity_api_key_provider)
+
+
 def _get_api_key() -> str:
     """
     Uses AgentCore Identity for API key management in deployed environments.
@@ -37,11 +59,11 @@ def _get_api_key() -> str:
                 f"{IDENTITY_ENV_VAR} not found. Add {IDENTITY_ENV_VAR}=your-key to .env.local"
             )
         return api_key
-    return _agentcore_identity_api_key_provider()
+    return _api_key_cache.get()
 
 
-def load_model() -> ChatAnthropic:
-    """Get authenticated Anthropic model client."""
+def _create_model() -> ChatAnthropic:
+    """Create an authenticated Anthropic model client."""
     return ChatAnthropic(
         model="claude-sonnet-4-5-20250929",
         api_key=_get_api_key()
@@ -51,10 +73,14 @@ def load_model() -> ChatAnthropic:
 import os
 from langchain_openai import ChatOpenAI
 from bedrock_agentcore.identity.auth import requires_api_key
+from model.credentials import CredentialCache
 
 IDENTITY_PROVIDER_NAME = "{{identityProviders.[0].name}}"
 IDENTITY_ENV_VAR = "{{identityProviders.[0].envVarName}}"
 
+# OpenAI caches repeated prompt prefixes automatically, without cache points
+PROMPT_CACHING = False
+
 
 @requires_api_key(provider_name=IDENTITY_PROVIDER_NAME)
 def _agentcore_identity_api_key_provider(api_key: str) -> str:
@@ -62,6 +88,10 @@ def _agentcore_identity_api_key_provider(api_key: str) -> str:
     return api_key
 
 
+# Fetched once for the process and refreshed before it expires, see model/credentials.py
+_api_key_cache = CredentialCache(IDENTITY_PROVIDER_NAME, _agentcore_identity_api_key_provider)
+
+
 def _get_api_key() -> str:
     """
     Uses AgentCore Identity for API key management in deployed environments.
@@ -74,11 +104,11 @@ def _get_api_key() -> str:
                 f"{IDENTITY_ENV_VAR} not found. Add {IDENTITY_ENV_VAR}=your-key to .env.local"
             )
         return api_key
-    return _agentcore_identity_api_key_provider()
+    return _api_key_cache.get()
 
 
-def load_model() -> ChatOpenAI:
-    """Get authenticated OpenAI model client."""
+def _create_model() -> ChatOpenAI:
+    """Create an authenticated OpenAI model client."""
     return ChatOpenAI(
         model="gpt-4.1",
         api_key=_get_api_key()
@@ -88,10 +118,14 @@ def load_model() -> ChatOpenAI:
 import os
 from langchain_google_genai import ChatGoogleGenerativeAI
 from bedrock_agentcore.identity.auth import requires_api_key
+from model.credentials import CredentialCache
 
 IDENTITY_PROVIDER_NAME = "{{identityProviders.[0].name}}"
 IDENTITY_ENV_VAR = "{{identityProviders.[0].envVarName}}"
 
+# Gemini caches repeated prompt prefixes implicitly, without cache points
+PROMPT_CACHING = False
+
 
 @requires_api_key(provider_name=IDENTITY_PROVIDER_NAME)
 def _agentcore_identity_api_key_provider(api_key: str) -> str:
@@ -99,6 +133,10 @@ def _agentcore_identity_api_key_provider(api_key: str) -> str:
     return api_key
 
 
+# Fetched once for the process and refreshed before it expires, see model/credentials.py
+_api_key_cache = CredentialCache(IDENTITY_PROVIDER_NAME, _agentcore_identity_api_key_provider)
+
+
 def _get_api_key() -> str:
     """
     Uses AgentCore Identity for API key management in deployed environments.
@@ -111,13 +149,50 @@ def _get_api_key() -> str:
                 f"{IDENTITY_ENV_VAR} not found. Add {IDENTITY_ENV_VAR}=your-key to .env.local"
             )
         return api_key
-    return _agentcore_identity_api_key_provider()
+    return _api_key_cache.get()
 
 
-def load_model() -> ChatGoogleGenerativeAI:
-    """Get authenticated Gemini model client."""
+def _create_model() -> ChatGoogleGenerativeAI:
+    """Create an authenticated Gemini model client."""
     return ChatGoogleGenerativeAI(
         model="gemini-2.5-flash",
         api_key=_get_api_key()
     )
 {{/if}}
+
+
+_model = None
+_model_api_key = None
+_model_lock = threading.Lock()
+
+
+def load_model() -> BaseChatModel:
+    """
+    Return the process-wide chat model, creating it on first use.
+    Every request shares it, so connections and credentials are set up once.
+    """
+    global _model, _model_api_key
+{{#if (eq modelProvider "Bedrock")}}
+    api_key = None
+{{else}}
+    # Served from the credential cache; a rotated key gets a new client
+    api_key = _get_api_key()
+{{/if}}
+    if _model is None or api_key != _model_api_key:
+        with _model_lock:
+            if _model is None or api_key != _model_api_key:
+                _model = _create_model()
+                # Logs and counts prompt cache reads and writes, see model/usage.py
+                _model.callbacks = [CacheUsageCallback()]
+                _model_api_key = api_key
+    return _model
+
+
+def system_prompt(text: str) -> SystemMessage:
+    """
+    Returns the agent system prompt, marked as a cache breakpoint when PROMPT_CACHING=1.
+    Tool definitions come before the system prompt in a request, so the breakpoint covers them too.
+    """
+    if not PROMPT_CACHING:
+        return SystemMessage(content=text)
+    return SystemMessage(content=[{"type": "text", "text": text, "cache_control": {"type": "ephemeral"}}])
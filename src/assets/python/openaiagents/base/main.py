@@ -1,15 +1,15 @@
 import os
+from contextlib import asynccontextmanager
 from agents import Agent, Runner, function_tool
 from bedrock_agentcore.runtime import BedrockAgentCoreApp
+from openai.types.responses import ResponseTextDeltaEvent
 from model.load import load_model
 {{#if hasGateway}}
 from mcp_client.client import get_all_gateway_mcp_servers
 {{else}}
 from mcp_client.client import get_streamable_http_mcp_client
 {{/if}}
-
-app = BedrockAgentCoreApp()
-log = app.logger
+from mcp_client.lifecycle import active_servers, close_all, connect_all
 
 # Get MCP Server
 {{#if hasGateway}}
@@ -19,13 +19,24 @@ mcp_server = get_streamable_http_mcp_client()
 mcp_servers = [mcp_server] if mcp_server else []
 {{/if}}
 
-_credentials_loaded = False
+
+@asynccontextmanager
+async def lifespan(app):
+    # MCP servers are connected once at startup and shared by every request, see mcp_client/lifecycle.py
+    await connect_all(mcp_servers)
+    yield
+    await close_all(mcp_servers)
+
+
+app = BedrockAgentCoreApp(lifespan=lifespan)
+log = app.logger
+
+# Set to 1, or send "stream": true in the payload, to stream tokens as they are generated
+STREAM_RESPONSES = os.getenv("STREAM_RESPONSES") == "1"
 
 def ensure_credentials_loaded():
-    global _credentials_loaded
-    if not _credentials_loaded:
-        load_model()
-        _credentials_loaded = True
+    # Served from the credential cache, and swaps in a rotated API key
+    load_model()
 
 
 # Define a simple function tool
@@ -35,51 +46,49 @@ def add_numbers(a: int, b: int) -> int:
     return a + b
 
 
+# Define the agent once; each run only narrows it to the MCP servers that are connected
+agent = Agent(
+    name="{{ name }}",
+    model="gpt-4.1",
+    mcp_servers=mcp_servers,
+    tools=[add_numbers]
+)
+
+
+async def get_agent():
+    servers = await active_servers(mcp_servers)
+    return agent if len(servers) == len(mcp_servers) else agent.clone(mcp_servers=servers)
+
+
 # Define the agent execution
 async def main(query):
     ensure_credentials_loaded()
     try:
-        {{#if hasGateway}}
-        if mcp_servers:
-            agent = Agent(
-                name="{{ name }}",
-                model="gpt-4.1",
-                mcp_servers=mcp_servers,
-                tools=[add_numbers]
-            )
-            result = await Runner.run(agent, query)
-            return result
-        else:
-            agent = Agent(
-                name="{{ name }}",
-                model="gpt-4.1",
-                mcp_servers=[],
-                tools=[add_numbers]
-            )
-            result = await Runner.run(agent, query)
-            return result
-        {{else}}
-        if mcp_servers:
-            async with mcp_servers[0] as server:
-                active_servers = [server]
-                agent = Agent(
-                    name="{{ name }}",
-                    model="gpt-4.1",
-                    mcp_servers=active_servers,
-                    tools=[add_numbers]
-                )
-                result = await Runner.run(agent, query)
-                return result
-        else:
-            agent = Agent(
-                name="{{ name }}",
-                model="gpt-4.1",
-                mcp_servers=[],
-                tools=[add_numbers]
-            )
-            result = await Runner.run(agent, query)
-            return result
-        {{/if}}
+        result = await Runner.run(await get_agent(), query)
+        return result
+    except Exception as e:
+        log.error(f"Error during agent execution: {e}", exc_info=True)
+        raise e
+
+
+async def stream(query):
+    """Yields model tokens as text and tool progress as {"event": ...} objects."""
+    ensure_credentials_loaded()
+    try:
+        result = Runner.run_streamed(await get_agent(), query)
+        tool_names = {}
+        async for event in result.stream_events():
+            if event.type == "raw_response_event" and isinstance(event.data, ResponseTextDeltaEvent):
+                yield event.data.delta
+            elif event.type == "run_item_stream_event" and event.name == "tool_called":
+                raw = event.item.raw_item
+                name = getattr(raw, "name", None)
+                tool_names[getattr(raw, "call_id", None)] = name
+                yield {"event": "tool_call", "name": name}
+            elif event.type == "run_item_stream_event" and event.name == "tool_output":
+                raw = event.item.raw_item
+                call_id = raw.get("call_id") if isinstance(raw, dict) else getattr(raw, "call_id", None)
+                yield {"event": "tool_result", "name": tool_names.get(call_id)}
     except Exception as e:
         log.error(f"Error during agent execution: {e}", exc_info=True)
         raise e
@@ -92,6 +101,10 @@ async def invoke(payload, context):
     # Process the user prompt
     prompt = payload.get("prompt", "What can you help me with?")
 
+    if payload.get("stream", STREAM_RESPONSES):
+        # Returning an async generator streams each item to the client as a server-sent event
+        return stream(prompt)
+
     # Run the agent
     result = await main(prompt)
 
@@ -0,0 +1,116 @@
+{{#if hasGateway}}
+import asyncio
+import base64
+import json
+import logging
+import os
+{{#if (includes gatewayAuthTypes "AWS_IAM")}}
+import threading
+{{/if}}
+import time
+from typing import Callable, Optional
+
+import httpx
+from model.credentials import CredentialCache
+{{#if (includes gatewayAuthTypes "AWS_IAM")}}
+from mcp_proxy_for_aws.sigv4_helper import SigV4HTTPXAuth, create_aws_session
+{{/if}}
+
+logger = logging.getLogger(__name__)
+
+# Seconds before a gateway access token expires at which it is refreshed in the background
+TOKEN_REFRESH_BEFORE_SECONDS = float(os.getenv("GATEWAY_TOKEN_REFRESH_BEFORE_SECONDS", "60"))
+# Seconds an access token without an exp claim is used before it is fetched again
+TOKEN_TTL_SECONDS = float(os.getenv("GATEWAY_TOKEN_TTL_SECONDS", "900"))
+
+
+def _seconds_until_expiry(token: str) -> Optional[float]:
+    """Seconds until the exp claim of a JWT, or None if the token is not a JWT with one."""
+    try:
+        payload = token.split(".")[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        return float(claims["exp"]) - time.time()
+    except (IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+class BearerTokenAuth(httpx.Auth):
+    """
+    httpx auth that sends a cached OAuth access token, such as an AgentCore Identity M2M token.
+
+    The token is fetched on first use and reused until it nears its exp claim, when one
+    background refresh replaces it, so steady-state requests never wait on a token fetch.
+    Concurrent requests that find no usable token share a single fetch. A request rejected
+    with 401 is sent once more with a freshly fetched token.
+    """
+
+    # Lets a rejected request be sent again
+    requires_request_body = True
+
+    def __init__(self, name: str, fetch: Callable[[], str]):
+        self._tokens = CredentialCache(
+            name,
+            fetch,
+            ttl=TOKEN_TTL_SECONDS,
+            refresh_before=TOKEN_REFRESH_BEFORE_SECONDS,
+            lifetime=_seconds_until_expiry,
+        )
+
+    def sync_auth_flow(self, request: httpx.Request):
+        token = self._authorize(request, self._tokens.get())
+        response = yield request
+        if response.status_code == 401:
+            self._reject(token)
+            self._authorize(request, self._tokens.get())
+            yield request
+
+    async def async_auth_flow(self, request: httpx.Request):
+        token = self._authorize(request, await self._get_token())
+        response = yield request
+        if response.status_code == 401:
+            self._reject(token)
+            self._authorize(request, await self._get_token())
+            yield request
+
+    async def _get_token(self) -> str:
+        if self._tokens.fresh:
+            return self._tokens.get()
+        # Fetching blocks, so it runs off the event loop in a copy of this request's context
+        return await asyncio.to_thread(self._tokens.get)
+
+    def _reject(self, token: str) -> None:
+        logger.info("Gateway rejected the %s access token, fetching a new one", self._tokens.name)
+        self._tokens.invalidate(token)
+
+    @staticmethod
+    def _authorize(request: httpx.Request, token: str) -> str:
+        if token:
+            request.headers["Authorization"] = f"Bearer {token}"
+        return token
+{{#if (includes gatewayAuthTypes "AWS_IAM")}}
+
+
+_sigv4_auth = None
+_sigv4_lock = threading.Lock()
+
+
+def get_sigv4_auth() -> SigV4HTTPXAuth:
+    """
+    Returns the SigV4 signer shared by every IAM gateway connection in the process.
+
+    The AWS credential chain is resolved once. Temporary credentials are refreshed by boto3
+    shortly before they expire, so signing a request never waits on credential resolution.
+    """
+    global _sigv4_auth
+    if _sigv4_auth is None:
+        with _sigv4_lock:
+            if _sigv4_auth is None:
+                session = create_aws_session()
+                credentials = session.get_credentials()
+                if credentials is None:
+                    raise RuntimeError("No AWS credentials found to sign gateway requests")
+                region = session.region_name or os.environ.get("AWS_REGION")
+                _sigv4_auth = SigV4HTTPXAuth(credentials, "bedrock-agentcore", region)
+    return _sigv4_auth
+{{/if}}
+{{/if}}
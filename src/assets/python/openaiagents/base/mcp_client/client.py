@@ -1,16 +1,60 @@
 import os
 import logging
-from agents.mcp import MCPServerStreamableHttp
+import time
+from mcp.types import ServerNotification, ToolListChangedNotification
+from mcp_client.lifecycle import PersistentMCPServer
 
 logger = logging.getLogger(__name__)
 
+# Seconds a listed tool set is reused before it is listed again, 0 lists on every run
+TOOLS_CACHE_TTL_SECONDS = float(os.getenv("MCP_TOOLS_CACHE_TTL_SECONDS", "300"))
+
+
+class CachedToolsMCPServer(PersistentMCPServer):
+    """
+    Persistent MCP server that reuses its tool list across runs.
+
+    The list is fetched again once it is older than TOOLS_CACHE_TTL_SECONDS, or as soon as the
+    server sends notifications/tools/list_changed.
+    """
+
+    def __init__(self, name: str, params: dict, ttl: float = TOOLS_CACHE_TTL_SECONDS):
+        super().__init__(
+            name=name,
+            params=params,
+            cache_tools_list=ttl > 0,
+            message_handler=self._handle_message,
+        )
+        self.ttl = ttl
+        self._listed_at: float | None = None
+
+    async def list_tools(self, *args, **kwargs):
+        listed_at = time.monotonic()
+        if self._listed_at is not None and listed_at - self._listed_at > self.ttl:
+            self.invalidate_tools_cache()
+        tools = await super().list_tools(*args, **kwargs)
+        if self._listed_at is None:
+            self._listed_at = listed_at
+        return tools
+
+    def invalidate_tools_cache(self):
+        super().invalidate_tools_cache()
+        self._listed_at = None
+
+    async def _handle_message(self, message) -> None:
+        if isinstance(message, ServerNotification) and isinstance(message.root, ToolListChangedNotification):
+            logger.info("MCP server %s reported changed tools, listing them again on the next run", self.name)
+            self.invalidate_tools_cache()
+
+
 {{#if hasGateway}}
-{{#if (includes gatewayAuthTypes "AWS_IAM")}}
 import httpx
-from mcp_proxy_for_aws.sigv4_helper import SigV4HTTPXAuth, create_aws_session
+{{#if (includes gatewayAuthTypes "AWS_IAM")}}
+from mcp_client.auth import get_sigv4_auth
 {{/if}}
 {{#if (includes gatewayAuthTypes "CUSTOM_JWT")}}
 from bedrock_agentcore.identity import requires_access_token
+from mcp_client.auth import BearerTokenAuth
 {{/if}}
 
 {{#each gatewayProviders}}
@@ -24,28 +68,32 @@ def _get_bearer_token_{{snakeCase name}}(*, access_token: str):
     """Obtain OAuth access token via AgentCore Identity for {{name}}."""
     return access_token
 
+
+# Caches the token and refreshes it before it expires, see mcp_client/auth.py
+_auth_{{snakeCase name}} = BearerTokenAuth("{{name}}", _get_bearer_token_{{snakeCase name}})
+
 {{/if}}
 {{/each}}
 
-def get_all_gateway_mcp_servers() -> list[MCPServerStreamableHttp]:
+def get_all_gateway_mcp_servers() -> list[CachedToolsMCPServer]:
     """Returns MCP servers for all configured gateways."""
     servers = []
     {{#each gatewayProviders}}
     url = os.environ.get("{{envVarName}}")
     if url:
         {{#if (eq authType "AWS_IAM")}}
-        session = create_aws_session()
-        auth = SigV4HTTPXAuth(session.get_credentials(), "bedrock-agentcore", session.region_name)
-        servers.append(MCPServerStreamableHttp(
+        # Shared signer, so connecting never resolves AWS credentials again, see mcp_client/auth.py
+        servers.append(CachedToolsMCPServer(
             name="{{name}}",
-            params={"url": url, "httpx_client_factory": lambda **kwargs: httpx.AsyncClient(auth=auth, **kwargs)}
+            params={"url": url, "httpx_client_factory": lambda **kwargs: httpx.AsyncClient(**{**kwargs, "auth": get_sigv4_auth()})}
         ))
         {{else if (eq authType "CUSTOM_JWT")}}
-        token = _get_bearer_token_{{snakeCase name}}()
-        headers = {"Authorization": f"Bearer {token}"} if token else {}
-        servers.append(MCPServerStreamableHttp(name="{{name}}", params={"url": url, "headers": headers}))
+        servers.append(CachedToolsMCPServer(
+            name="{{name}}",
+            params={"url": url, "httpx_client_factory": lambda **kwargs: httpx.AsyncClient(**{**kwargs, "auth": _auth_{{snakeCase name}}})}
+        ))
         {{else}}
-        servers.append(MCPServerStreamableHttp(name="{{name}}", params={"url": url}))
+        servers.append(CachedToolsMCPServer(name="{{name}}", params={"url": url}))
         {{/if}}
     else:
         logger.warning("{{envVarName}} not set — {{name}} gateway tools unavailable")
@@ -56,10 +104,10 @@ def get_all_gateway_mcp_servers() -> list[MCPServerStreamableHttp]:
 EXAMPLE_MCP_ENDPOINT = "https://mcp.exa.ai/mcp"
 
 
-def get_streamable_http_mcp_client() -> MCPServerStreamableHttp:
+def get_streamable_http_mcp_client() -> CachedToolsMCPServer:
     """Returns an MCP Client compatible with OpenAI Agents SDK."""
     # to use an MCP server that supports bearer authentication, add headers={"Authorization": f"Bearer {access_token}"}
-    return MCPServerStreamableHttp(
+    return CachedToolsMCPServer(
         name="AgentCore Gateway MCP", params={"url": EXAMPLE_MCP_ENDPOINT}
     )
 {{/if}}
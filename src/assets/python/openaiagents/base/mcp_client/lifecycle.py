@@ -0,0 +1,165 @@
+import asyncio
+import contextlib
+import logging
+import os
+
+from agents.mcp import MCPServerStreamableHttp
+
+logger = logging.getLogger(__name__)
+
+# Seconds between health-check pings on an idle connection
+PING_INTERVAL_SECONDS = float(os.getenv("MCP_SESSION_PING_INTERVAL_SECONDS", "60"))
+# Seconds a request waits for a server that is still connecting before running without it
+CONNECT_TIMEOUT_SECONDS = float(os.getenv("MCP_SESSION_CONNECT_TIMEOUT_SECONDS", "30"))
+# Longest pause between attempts to reconnect a server that cannot be reached
+MAX_RECONNECT_DELAY_SECONDS = 30.0
+
+
+class PersistentMCPServer(MCPServerStreamableHttp):
+    """
+    Streamable HTTP MCP server that stays connected for the life of the process.
+
+    start() opens the connection in a task of its own, because the MCP transport must be
+    entered and exited by the same task and a failing transport cancels the task holding it.
+    That task pings the server while idle and reconnects, with backoff, whenever the
+    connection is lost. Calls made while it reconnects wait for the new connection. A tool
+    listing whose connection is lost mid-call is retried once on the new connection; a tool
+    call is not, so a tool with side effects never runs twice.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._connected = asyncio.Event()
+        self._first_attempt = asyncio.Event()
+        self._lost: asyncio.Event | None = None
+        self._owner: asyncio.Task | None = None
+        self._stopping = False
+        self._was_connected = False
+
+    def start(self) -> None:
+        """Start connecting in the background. Safe to call more than once."""
+        if self._owner is None:
+            self._stopping = False
+            self._owner = asyncio.create_task(self._own())
+
+    async def stop(self) -> None:
+        """Close the connection and stop reconnecting."""
+        if self._owner is None:
+            return
+        self._stopping = True
+        if self._connected.is_set():
+            # Lets the owner task close the connection itself
+            self._lost.set()
+        else:
+            # Nothing to close, so stop connecting or waiting to reconnect
+            self._owner.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._owner
+        self._owner = None
+
+    async def wait_connected(self, timeout: float = CONNECT_TIMEOUT_SECONDS) -> bool:
+        """Wait until the server is connected, returning False if it is not within timeout."""
+        self.start()
+        try:
+            await asyncio.wait_for(self._connected.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def ready(self, timeout: float = CONNECT_TIMEOUT_SECONDS) -> bool:
+        """
+        Whether the server is connected, first waiting for its initial connection attempt.
+        Unlike wait_connected, this does not wait for a server that is reconnecting.
+        """
+        self.start()
+        try:
+            await asyncio.wait_for(self._first_attempt.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return self._connected.is_set()
+
+    async def list_tools(self, *args, **kwargs):
+        await self._wait_if_reconnecting()
+        session = self.session
+        try:
+            return await super().list_tools(*args, **kwargs)
+        except Exception:
+            # Only a listing whose connection was dropped under it is retried
+            if self._owner is None or session is None or self.session is session:
+                raise
+            logger.info("MCP session to %s was lost while listing tools, retrying", self.name)
+            await self._wait_if_reconnecting()
+            return await super().list_tools(*args, **kwargs)
+
+    async def call_tool(self, *args, **kwargs):
+        # Not retried once sent, the server may already have run a call whose connection dropped
+        await self._wait_if_reconnecting()
+        return await super().call_tool(*args, **kwargs)
+
+    async def _wait_if_reconnecting(self) -> None:
+        # A run that started while the server was connected waits out a reconnect instead of failing
+        if self._owner is not None and self.session is None:
+            await self.wait_connected()
+
+    async def _own(self) -> None:
+        delay = 1.0
+        while not self._stopping:
+            self._lost = asyncio.Event()
+            self._was_connected = False
+            # A failing transport cancels the task it runs in, so run it in a child task
+            held = asyncio.create_task(self._hold(self._lost))
+            try:
+                await asyncio.wait({held})
+            except asyncio.CancelledError:
+                held.cancel()
+                raise
+            if self._stopping:
+                break
+            if self._was_connected:
+                delay = 1.0
+            logger.warning("MCP session to %s ended, reconnecting in %.0fs", self.name, delay)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, MAX_RECONNECT_DELAY_SECONDS)
+
+    async def _hold(self, lost: asyncio.Event) -> None:
+        """Hold one connection until it is lost or stopped."""
+        try:
+            await self.connect()
+        except Exception as e:
+            logger.warning("Could not connect MCP server %s: %r", self.name, e)
+            return
+        finally:
+            self._first_attempt.set()
+        self._was_connected = True
+        self._connected.set()
+        logger.info("Connected MCP server %s", self.name)
+        try:
+            while not lost.is_set():
+                try:
+                    await asyncio.wait_for(lost.wait(), PING_INTERVAL_SECONDS)
+                except asyncio.TimeoutError:
+                    # Raises if the server is unreachable, which ends this connection
+                    await asyncio.wait_for(self.session.send_ping(), CONNECT_TIMEOUT_SECONDS)
+        except Exception as e:
+            logger.debug("MCP session to %s failed a health check: %r", self.name, e)
+        finally:
+            self._connected.clear()
+            await self.cleanup()
+
+
+async def connect_all(servers: list[PersistentMCPServer]) -> None:
+    """Connect every server, waiting up to CONNECT_TIMEOUT_SECONDS for them together."""
+    results = await asyncio.gather(*(server.ready() for server in servers))
+    for server, connected in zip(servers, results):
+        if not connected:
+            logger.warning("MCP server %s is not connected yet, its tools are unavailable until it is", server.name)
+
+
+async def active_servers(servers: list[PersistentMCPServer]) -> list[PersistentMCPServer]:
+    """Returns the servers that are connected now, so a request never waits on the MCP handshake."""
+    results = await asyncio.gather(*(server.ready() for server in servers))
+    return [server for server, connected in zip(servers, results) if connected]
+
+
+async def close_all(servers: list[PersistentMCPServer]) -> None:
+    await asyncio.gather(*(server.stop() for server in servers))
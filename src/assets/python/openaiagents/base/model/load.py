@@ -1,5 +1,9 @@
 import os
+import threading
+from agents import set_default_openai_client
+from openai import AsyncOpenAI
 from bedrock_agentcore.identity.auth import requires_api_key
+from model.credentials import CredentialCache
 
 IDENTITY_PROVIDER_NAME = "{{identityProviders.[0].name}}"
 IDENTITY_ENV_VAR = "{{identityProviders.[0].envVarName}}"
@@ -11,6 +15,10 @@ def _agentcore_identity_api_key_provider(api_key: str) -> str:
     return api_key
 
 
+# Fetched once for the process and refreshed before it expires, see model/credentials.py
+_api_key_cache = CredentialCache(IDENTITY_PROVIDER_NAME, _agentcore_identity_api_key_provider)
+
+
 def _get_api_key() -> str:
     """
     Uses AgentCore Identity for API key management in deployed environments.
@@ -23,15 +31,32 @@ def _get_api_key() -> str:
                 f"{IDENTITY_ENV_VAR} not found. Add {IDENTITY_ENV_VAR}=your-key to .env.local"
             )
         return api_key
-    return _agentcore_identity_api_key_provider()
+    return _api_key_cache.get()
+
+
+_client = None
+_client_lock = threading.Lock()
 
 
-def load_model() -> None:
+def load_model() -> AsyncOpenAI:
     """
     Set up OpenAI API key authentication.
     Uses AgentCore Identity for API key management in deployed environments,
     and falls back to .env file for local development.
-    Sets the OPENAI_API_KEY environment variable for the OpenAI Agents SDK.
+    Creates one AsyncOpenAI client for the process and registers it as the OpenAI Agents SDK
+    default, so every run shares its HTTP connection pool instead of creating a client per run.
+    A rotated API key is swapped into the existing client.
     """
+    global _client
+    # Served from the credential cache
     api_key = _get_api_key()
-    os.environ["OPENAI_API_KEY"] = api_key if api_key else ""
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                os.environ["OPENAI_API_KEY"] = api_key if api_key else ""
+                _client = AsyncOpenAI(api_key=api_key)
+                set_default_openai_client(_client)
+    elif api_key and _client.api_key != api_key:
+        os.environ["OPENAI_API_KEY"] = api_key
+        _client.api_key = api_key
+    return _client
@@ -1,12 +1,17 @@
 from strands import Agent, tool
 from bedrock_agentcore.runtime import BedrockAgentCoreApp
-from model.load import load_model
+from model.load import load_model, system_prompt
+from model.usage import record_cache_usage
+from streaming.coalesce import coalesce
 {{#if hasGateway}}
-from mcp_client.client import get_all_gateway_mcp_clients
+from mcp_client.client import get_all_gateway_mcp_clients, prewarm_mcp_clients
 {{else}}
-from mcp_client.client import get_streamable_http_mcp_client
+from mcp_client.client import get_streamable_http_mcp_client, prewarm_mcp_clients
 {{/if}}
 {{#if hasMemory}}
+import atexit
+from memory.cache import AgentCache
+from memory.locks import SessionLocks
 from memory.session import get_memory_session_manager
 {{/if}}
 
@@ -20,6 +25,9 @@ mcp_clients = get_all_gateway_mcp_clients()
 mcp_clients = [get_streamable_http_mcp_client()]
 {{/if}}
 
+# Optionally list MCP tools before the runtime starts serving, see mcp_client/client.py
+prewarm_mcp_clients(mcp_clients)
+
 # Define a collection of tools used by the model
 tools = []
 
@@ -37,40 +45,62 @@ for mcp_client in mcp_clients:
 
 
 {{#if hasMemory}}
-def agent_factory():
-    cache = {}
-    def get_or_create_agent(session_id, user_id):
-        key = f"{session_id}/{user_id}"
-        if key not in cache:
-            # Create an agent for the given session_id and user_id
-            cache[key] = Agent(
-                model=load_model(),
-                session_manager=get_memory_session_manager(session_id, user_id),
-                system_prompt="""
-                    You are a helpful assistant. Use tools when appropriate.
-                """,
-                tools=tools
-            )
-        return cache[key]
-    return get_or_create_agent
-get_or_create_agent = agent_factory()
+# Bounded cache of per-session agents, see memory/cache.py for sizing options
+agent_cache = AgentCache()
+# Flushes every session's buffered conversation events on shutdown, see memory/session.py
+atexit.register(agent_cache.clear)
+# Serializes requests within a session, see memory/locks.py for the wait timeout
+session_locks = SessionLocks()
+
+def lease_agent(session_id, user_id):
+    def create_agent():
+        # Create an agent for the given session_id and user_id
+        return Agent(
+            model=load_model(),
+            session_manager=get_memory_session_manager(session_id, user_id),
+            system_prompt=system_prompt("""
+                You are a helpful assistant. Use tools when appropriate.
+            """),
+            tools=tools
+        )
+    # Held until the request finishes, so the agent is not evicted while it runs
+    return agent_cache.lease(f"{session_id}/{user_id}", create_agent)
 {{else}}
 _agent = None
 
 def get_or_create_agent():
     global _agent
-    if _agent is None:
+    model = load_model()
+    # A rotated API key comes with a new model
+    if _agent is None or _agent.model is not model:
         _agent = Agent(
-            model=load_model(),
-            system_prompt="""
+            model=model,
+            system_prompt=system_prompt("""
                 You are a helpful assistant. Use tools when appropriate.
-            """,
+            """),
             tools=tools
         )
     return _agent
 {{/if}}
 
 
+async def stream_response(agent, prompt):
+    # Execute and format response
+    stream = agent.stream_async(prompt)
+
+    async for event in stream:
+        # Handle Text parts of the response
+        if "data" in event and isinstance(event["data"], str):
+            yield event["data"]
+        elif "result" in event:
+            # Logs and counts this request's prompt cache reads and writes, see model/usage.py.
+            # accumulated_usage would count every earlier request of a reused agent again.
+            invocation = event["result"].metrics.latest_agent_invocation
+            if invocation is not None:
+                usage = invocation.usage
+                record_cache_usage(usage.get("cacheReadInputTokens", 0), usage.get("cacheWriteInputTokens", 0))
+
+
 @app.entrypoint
 async def invoke(payload, context):
     log.info("Invoking Agent.....")
@@ -78,19 +108,19 @@ async def invoke(payload, context):
 {{#if hasMemory}}
     session_id = getattr(context, 'session_id', 'default-session')
     user_id = getattr(context, 'user_id', 'default-user')
-    agent = get_or_create_agent(session_id, user_id)
+
+    # Requests for the same session run one at a time, different sessions run in parallel
+    async with session_locks.hold(f"{session_id}/{user_id}"), lease_agent(session_id, user_id) as agent:
+        # Token fragments are merged into fewer chunks, see streaming/coalesce.py for tuning
+        async for chunk in coalesce(stream_response(agent, payload.get("prompt"))):
+            yield chunk
 {{else}}
     agent = get_or_create_agent()
+    # Token fragments are merged into fewer chunks, see streaming/coalesce.py for tuning
+    async for chunk in coalesce(stream_response(agent, payload.get("prompt"))):
+        yield chunk
 {{/if}}
 
-    # Execute and format response
-    stream = agent.stream_async(payload.get("prompt"))
-
-    async for event in stream:
-        # Handle Text parts of the response
-        if "data" in event and isinstance(event["data"], str):
-            yield event["data"]
-
 
 if __name__ == "__main__":
     app.run()
@@ -1,16 +1,62 @@
+import asyncio
 import os
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
 from mcp.client.streamable_http import streamablehttp_client
 from strands.tools.mcp.mcp_client import MCPClient
 
 logger = logging.getLogger(__name__)
 
+# Set MCP_PREWARM=1 to connect to MCP servers and list their tools at startup instead of on the first request
+MCP_PREWARM = os.getenv("MCP_PREWARM") == "1"
+# Seconds to wait for each MCP server during prewarm before serving traffic without it
+MCP_PREWARM_TIMEOUT_SECONDS = float(os.getenv("MCP_PREWARM_TIMEOUT_SECONDS", "10"))
+
+# Registered as a consumer of each prewarmed client so its session outlives evicted agents
+_PREWARM_CONSUMER = "prewarm"
+
+
+class SharedMCPClient(MCPClient):
+    """
+    MCPClient shared by prewarm and every agent in the process.
+
+    Prewarm and the first requests can load its tools at the same time. MCPClient refuses to start
+    a session that is already starting, and it publishes an empty tool list before listing
+    finishes. Loading is serialized instead: the first caller opens the session and lists the
+    tools, and the others wait for it and then get the finished list.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Reentrant because load_tools() calls start(), and a failed start() calls stop()
+        self._start_lock = threading.RLock()
+        self._started = False
+
+    def start(self) -> "SharedMCPClient":
+        with self._start_lock:
+            if not self._started:
+                super().start()
+                self._started = True
+        return self
+
+    async def load_tools(self, **kwargs):
+        # Every caller runs this on its own thread and event loop, so blocking on the lock is safe
+        with self._start_lock:
+            return await super().load_tools(**kwargs)
+
+    def stop(self, *args, **kwargs) -> None:
+        with self._start_lock:
+            self._started = False
+            super().stop(*args, **kwargs)
+
 {{#if hasGateway}}
 {{#if (includes gatewayAuthTypes "AWS_IAM")}}
-from mcp_proxy_for_aws.client import aws_iam_streamablehttp_client
+from mcp_client.auth import get_sigv4_auth
 {{/if}}
 {{#if (includes gatewayAuthTypes "CUSTOM_JWT")}}
 from bedrock_agentcore.identity import requires_access_token
+from mcp_client.auth import BearerTokenAuth
 {{/if}}
 
 {{#each gatewayProviders}}
@@ -24,6 +70,10 @@ def _get_bearer_token_{{snakeCase name}}(*, access_token: str):
     """Obtain OAuth access token via AgentCore Identity for {{name}}."""
     return access_token
 
+
+# Caches the token and refreshes it before it expires, see mcp_client/auth.py
+_auth_{{snakeCase name}} = BearerTokenAuth("{{name}}", _get_bearer_token_{{snakeCase name}})
+
 {{/if}}
 {{/each}}
 {{#each gatewayProviders}}
@@ -34,13 +84,12 @@ def get_{{snakeCase name}}_mcp_client() -> MCPClient | None:
         logger.warning("{{envVarName}} not set — {{name}} gateway tools unavailable")
         return None
     {{#if (eq authType "AWS_IAM")}}
-    return MCPClient(lambda: aws_iam_streamablehttp_client(url, aws_service="bedrock-agentcore", aws_region=os.environ.get("AWS_REGION", os.environ.get("AWS_DEFAULT_REGION"))))
+    # Shared signer, so connecting never resolves AWS credentials again, see mcp_client/auth.py
+    return SharedMCPClient(lambda: streamablehttp_client(url, auth=get_sigv4_auth()))
     {{else if (eq authType "CUSTOM_JWT")}}
-    token = _get_bearer_token_{{snakeCase name}}()
-    headers = {"Authorization": f"Bearer {token}"} if token else {}
-    return MCPClient(lambda: streamablehttp_client(url, headers=headers))
+    return SharedMCPClient(lambda: streamablehttp_client(url, auth=_auth_{{snakeCase name}}))
     {{else}}
-    return MCPClient(lambda: streamablehttp_client(url))
+    return SharedMCPClient(lambda: streamablehttp_client(url))
     {{/if}}
 
 {{/each}}
@@ -60,5 +109,40 @@ EXAMPLE_MCP_ENDPOINT = "https://mcp.exa.ai/mcp"
 def get_streamable_http_mcp_client() -> MCPClient:
     """Returns an MCP Client compatible with Strands"""
     # to use an MCP server that supports bearer authentication, add headers={"Authorization": f"Bearer {access_token}"}
-    return MCPClient(lambda: streamablehttp_client(EXAMPLE_MCP_ENDPOINT))
+    return SharedMCPClient(lambda: streamablehttp_client(EXAMPLE_MCP_ENDPOINT))
 {{/if}}
+
+
+def _prewarm(client: MCPClient) -> int:
+    client.add_consumer(_PREWARM_CONSUMER)
+    try:
+        # load_tools starts the client session and caches the tool list for every agent
+        return len(asyncio.run(client.load_tools()))
+    except Exception:
+        client.remove_consumer(_PREWARM_CONSUMER)
+        raise
+
+
+def prewarm_mcp_clients(clients: list[MCPClient | None]) -> None:
+    """
+    Connect to the MCP servers and list their tools concurrently when MCP_PREWARM=1.
+    Servers that do not finish within MCP_PREWARM_TIMEOUT_SECONDS keep connecting in the background.
+    """
+    clients = [client for client in clients if client]
+    if not MCP_PREWARM or not clients:
+        return
+    executor = ThreadPoolExecutor(max_workers=len(clients), thread_name_prefix="mcp-prewarm")
+    futures = [executor.submit(_prewarm, client) for client in clients]
+    done, pending = wait(futures, timeout=MCP_PREWARM_TIMEOUT_SECONDS)
+    executor.shutdown(wait=False)
+    for future in done:
+        try:
+            logger.info("Prewarmed MCP server with %d tools", future.result())
+        except Exception:
+            logger.warning("MCP prewarm failed, tools will be loaded on first use", exc_info=True)
+    if pending:
+        logger.warning(
+            "%d MCP server(s) not ready after %ss, continuing in the background",
+            len(pending),
+            MCP_PREWARM_TIMEOUT_SECONDS,
+        )
@@ -1,20 +1,40 @@
+import threading
+
+from strands.models import Model
+
 {{#if (eq modelProvider "Bedrock")}}
+import os
+
+from botocore.config import Config as BotocoreConfig
 from strands.models.bedrock import BedrockModel
 
+# Set to 1 to cache the system prompt and tool definitions, so later turns read them from the cache
+PROMPT_CACHING = os.getenv("PROMPT_CACHING") == "1"
 
-def load_model() -> BedrockModel:
-    """Get Bedrock model client using IAM credentials."""
-    return BedrockModel(model_id="global.anthropic.claude-sonnet-4-5-20250929-v1:0")
+# Pool and keep alive enough connections for concurrent sessions sharing the client
+BOTO_CLIENT_CONFIG = BotocoreConfig(max_pool_connections=50, tcp_keepalive=True)
+
+
+def _create_model() -> BedrockModel:
+    """Create a Bedrock model client using IAM credentials."""
+    return BedrockModel(
+        model_id="global.anthropic.claude-sonnet-4-5-20250929-v1:0",
+        boto_client_config=BOTO_CLIENT_CONFIG,
+    )
 {{/if}}
 {{#if (eq modelProvider "Anthropic")}}
 import os
 
 from strands.models.anthropic import AnthropicModel
 from bedrock_agentcore.identity.auth import requires_api_key
+from model.credentials import CredentialCache
 
 IDENTITY_PROVIDER_NAME = "{{identityProviders.[0].name}}"
 IDENTITY_ENV_VAR = "{{identityProviders.[0].envVarName}}"
 
+# Set to 1 to cache the system prompt and tool definitions, so later turns read them from the cache
+PROMPT_CACHING = os.getenv("PROMPT_CACHING") == "1"
+
 
 @requires_api_key(provider_name=IDENTITY_PROVIDER_NAME)
 def _agentcore_identity_api_key_provider(api_key: str) -> str:
@@ -22,6 +42,10 @@ def _agentcore_identity_api_key_provider(api_key: str) -> str:
     return api_key
 
 
+# Fetched once for the process and refreshed before it expires, see model/credentials.py
+_api_key_cache = CredentialCache(IDENTITY_PROVIDER_NAME, _agentcore_identity_api_key_provider)
+
+
 def _get_api_key() -> str:
     """
     Uses AgentCore Identity for API key management in deployed environments.
@@ -34,11 +58,11 @@ def _get_api_key() -> str:
                 f"{IDENTITY_ENV_VAR} not found. Add {IDENTITY_ENV_VAR}=your-key to .env.local"
             )
         return api_key
-    return _agentcore_identity_api_key_provider()
+    return _api_key_cache.get()
 
 
-def load_model() -> AnthropicModel:
-    """Get authenticated Anthropic model client."""
+def _create_model() -> AnthropicModel:
+    """Create an authenticated Anthropic model client."""
     return AnthropicModel(
         client_args={"api_key": _get_api_key()},
         model_id="claude-sonnet-4-5-20250929",
@@ -48,12 +72,17 @@ def load_model() -> AnthropicModel:
 {{#if (eq modelProvider "OpenAI")}}
 import os
 
+from openai import AsyncOpenAI
 from strands.models.openai import OpenAIModel
 from bedrock_agentcore.identity.auth import requires_api_key
+from model.credentials import CredentialCache
 
 IDENTITY_PROVIDER_NAME = "{{identityProviders.[0].name}}"
 IDENTITY_ENV_VAR = "{{identityProviders.[0].envVarName}}"
 
+# OpenAI caches repeated prompt prefixes automatically, without cache points
+PROMPT_CACHING = False
+
 
 @requires_api_key(provider_name=IDENTITY_PROVIDER_NAME)
 def _agentcore_identity_api_key_provider(api_key: str) -> str:
@@ -61,6 +90,10 @@ def _agentcore_identity_api_key_provider(api_key: str) -> str:
     return api_key
 
 
+# Fetched once for the process and refreshed before it expires, see model/credentials.py
+_api_key_cache = CredentialCache(IDENTITY_PROVIDER_NAME, _agentcore_identity_api_key_provider)
+
+
 def _get_api_key() -> str:
     """
     Uses AgentCore Identity for API key management in deployed environments.
@@ -73,25 +106,31 @@ def _get_api_key() -> str:
                 f"{IDENTITY_ENV_VAR} not found. Add {IDENTITY_ENV_VAR}=your-key to .env.local"
             )
         return api_key
-    return _agentcore_identity_api_key_provider()
+    return _api_key_cache.get()
 
 
-def load_model() -> OpenAIModel:
-    """Get authenticated OpenAI model client."""
+def _create_model() -> OpenAIModel:
+    """Create an authenticated OpenAI model client."""
+    # Inject one client so its connection pool is reused instead of opening a client per request
     return OpenAIModel(
-        client_args={"api_key": _get_api_key()},
+        client=AsyncOpenAI(api_key=_get_api_key()),
         model_id="gpt-4.1",
     )
 {{/if}}
 {{#if (eq modelProvider "Gemini")}}
 import os
 
+from google import genai
 from strands.models.gemini import GeminiModel
 from bedrock_agentcore.identity.auth import requires_api_key
+from model.credentials import CredentialCache
 
 IDENTITY_PROVIDER_NAME = "{{identityProviders.[0].name}}"
 IDENTITY_ENV_VAR = "{{identityProviders.[0].envVarName}}"
 
+# Gemini caches repeated prompt prefixes implicitly, without cache points
+PROMPT_CACHING = False
+
 
 @requires_api_key(provider_name=IDENTITY_PROVIDER_NAME)
 def _agentcore_identity_api_key_provider(api_key: str) -> str:
@@ -99,6 +138,10 @@ def _agentcore_identity_api_key_provider(api_key: str) -> str:
     return api_key
 
 
+# Fetched once for the process and refreshed before it expires, see model/credentials.py
+_api_key_cache = CredentialCache(IDENTITY_PROVIDER_NAME, _agentcore_identity_api_key_provider)
+
+
 def _get_api_key() -> str:
     """
     Uses AgentCore Identity for API key management in deployed environments.
@@ -111,13 +154,49 @@ def _get_api_key() -> str:
                 f"{IDENTITY_ENV_VAR} not found. Add {IDENTITY_ENV_VAR}=your-key to .env.local"
             )
         return api_key
-    return _agentcore_identity_api_key_provider()
+    return _api_key_cache.get()
 
 
-def load_model() -> GeminiModel:
-    """Get authenticated Gemini model client."""
+def _create_model() -> GeminiModel:
+    """Create an authenticated Gemini model client."""
+    # Inject one client so its connection pool is reused instead of opening a client per request
     return GeminiModel(
-        client_args={"api_key": _get_api_key()},
+        client=genai.Client(api_key=_get_api_key()),
         model_id="gemini-2.5-flash",
     )
 {{/if}}
+
+
+_model = None
+_model_api_key = None
+_model_lock = threading.Lock()
+
+
+def load_model() -> Model:
+    """
+    Return the process-wide model client, creating it on first use.
+    Every agent shares it, so connections and credentials are set up once rather than per session.
+    """
+    global _model, _model_api_key
+{{#if (eq modelProvider "Bedrock")}}
+    api_key = None
+{{else}}
+    # Served from the credential cache; a rotated key gets a new client
+    api_key = _get_api_key()
+{{/if}}
+    if _model is None or api_key != _model_api_key:
+        with _model_lock:
+            if _model is None or api_key != _model_api_key:
+                _model = _create_model()
+                _model_api_key = api_key
+    return _model
+
+
+def system_prompt(text: str) -> str | list[dict]:
+    """
+    Returns the agent system prompt, followed by a cache point when PROMPT_CACHING=1.
+    Tool definitions come before the system prompt in a request, so the cache point covers them too.
+    """
+    if not PROMPT_CACHING:
+        return text
+    return [{"text": text}, {"cachePoint": {"type": "default"}}]
@@ -0,0 +1,26 @@
+import logging
+
+from opentelemetry import metrics
+
+logger = logging.getLogger(__name__)
+meter = metrics.get_meter(__name__)
+
+_cache_read_tokens = meter.create_counter(
+    "model.cache_read_input_tokens",
+    unit="{token}",
+    description="Input tokens served from the prompt cache",
+)
+_cache_write_tokens = meter.create_counter(
+    "model.cache_write_input_tokens",
+    unit="{token}",
+    description="Input tokens written to the prompt cache",
+)
+
+
+def record_cache_usage(read_tokens: int, write_tokens: int) -> None:
+    """Logs and counts the prompt cache reads and writes reported for a model call."""
+    if not read_tokens and not write_tokens:
+        return
+    _cache_read_tokens.add(read_tokens)
+    _cache_write_tokens.add(write_tokens)
+    logger.info("Prompt cache: %d input tokens read, %d written", read_tokens, write_tokens)
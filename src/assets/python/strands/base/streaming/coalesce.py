@@ -0,0 +1,94 @@
+import asyncio
+import contextlib
+import os
+from typing import AsyncIterator
+
+# Flush buffered text once it reaches this many bytes
+MAX_BYTES = int(os.getenv("STREAM_COALESCE_MAX_BYTES", "512"))
+# Flush buffered text at most this many milliseconds after it arrived, 0 disables coalescing
+MAX_LATENCY_MS = float(os.getenv("STREAM_COALESCE_MAX_LATENCY_MS", "20"))
+
+_END = object()
+
+
+async def _pump(chunks: AsyncIterator[str], queue: asyncio.Queue) -> None:
+    """Move chunks from the source stream onto the queue, ending with _END or the raised error."""
+    try:
+        async for chunk in chunks:
+            queue.put_nowait(chunk)
+    except Exception as e:
+        queue.put_nowait(e)
+    else:
+        queue.put_nowait(_END)
+
+
+async def coalesce(
+    chunks: AsyncIterator[str],
+    max_bytes: int = MAX_BYTES,
+    max_latency_ms: float = MAX_LATENCY_MS,
+) -> AsyncIterator[str]:
+    """
+    Merge small streamed text chunks into fewer, larger ones.
+
+    The first chunk is passed through immediately to keep time-to-first-token low. Later
+    chunks are buffered and flushed once they reach max_bytes, once the oldest buffered
+    chunk has waited max_latency_ms, or when the stream ends.
+    """
+    if max_latency_ms <= 0 or max_bytes <= 1:
+        async for chunk in chunks:
+            yield chunk
+        return
+
+    loop = asyncio.get_running_loop()
+    latency = max_latency_ms / 1000
+    queue: asyncio.Queue = asyncio.Queue()
+    # The source runs in its own task so the latency timer can fire while it is between tokens
+    producer = asyncio.create_task(_pump(chunks, queue))
+    getter = None
+    try:
+        first = await queue.get()
+        if first is _END:
+            return
+        if isinstance(first, Exception):
+            raise first
+        yield first
+
+        buffer: list[str] = []
+        size = 0
+        deadline = 0.0
+        while True:
+            if getter is None:
+                getter = asyncio.ensure_future(queue.get())
+            timeout = max(0.0, deadline - loop.time()) if buffer else None
+            # asyncio.wait leaves the getter pending on timeout, so no chunk is lost
+            done, _ = await asyncio.wait({getter}, timeout=timeout)
+            if not done:
+                yield "".join(buffer)
+                buffer.clear()
+                size = 0
+                continue
+
+            item = getter.result()
+            getter = None
+            if item is _END or isinstance(item, Exception):
+                if buffer:
+                    yield "".join(buffer)
+                if item is _END:
+                    return
+                raise item
+
+            if not buffer:
+                deadline = loop.time() + latency
+            buffer.append(item)
+            size += len(item.encode("utf-8"))
+            if size >= max_bytes:
+                yield "".join(buffer)
+                buffer.clear()
+                size = 0
+    finally:
+        # Stop the agent if the caller went away before the stream finished
+        if getter is not None:
+            getter.cancel()
+        producer.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await producer
@@ -0,0 +1,107 @@
+"""
+Benchmark of the per-turn overhead of memory, against the local memory backend.
+
+Runs the same conversations with and without a memory session manager and reports the median
+time of a turn, and of restoring an agent for a session that already has turns. The model is a
+fake that answers immediately, so the difference is the time memory adds to each turn: writing
+the conversation events, retrieving long-term memories and updating the agent state.
+
+Run from the agent root: python -m memory.benchmark --sessions 20 --turns 10
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import tempfile
+import time
+
+# Selected before memory.session reads them, the benchmark never calls AgentCore Memory
+os.environ["MEMORY_BACKEND"] = "local"
+os.environ["LOCAL_MEMORY_PATH"] = os.path.join(tempfile.mkdtemp(), "benchmark.sqlite")
+
+from strands import Agent
+from strands.models import Model
+
+from memory.session import get_memory_session_manager
+
+# The session manager warns on every construction that it must be invoked asynchronously, as it is here
+logging.getLogger("bedrock_agentcore").setLevel(logging.ERROR)
+
+PROMPTS = [
+    "I prefer green tea in the morning.",
+    "My dog is called Rex and he loves the beach.",
+    "What should I drink today?",
+    "Remind me what my dog likes.",
+]
+
+
+class FakeModel(Model):
+    """Answers every turn with the same text, without a network call."""
+
+    def update_config(self, **model_config):
+        pass
+
+    def get_config(self):
+        return {}
+
+    async def structured_output(self, output_model, prompt, system_prompt=None, **kwargs):
+        raise NotImplementedError
+
+    async def stream(self, messages, tool_specs=None, system_prompt=None, **kwargs):
+        yield {"messageStart": {"role": "assistant"}}
+        yield {"contentBlockStart": {"start": {}}}
+        yield {"contentBlockDelta": {"delta": {"text": "Noted."}}}
+        yield {"contentBlockStop": {}}
+        yield {"messageStop": {"stopReason": "end_turn"}}
+        yield {"metadata": {"usage": {"inputTokens": 0, "outputTokens": 0, "totalTokens": 0}, "metrics": {"latencyMs": 0}}}
+
+
+def create_agent(session_id: str, memory: bool) -> Agent:
+    session_manager = get_memory_session_manager(session_id, "benchmark-user") if memory else None
+    return Agent(model=FakeModel(), session_manager=session_manager, callback_handler=None)
+
+
+def close(agent: Agent) -> None:
+    if agent._session_manager is not None:
+        agent._session_manager.close()
+
+
+async def run(name: str, sessions: int, turns: int, memory: bool) -> float:
+    turn_times, restore_times = [], []
+    for session in range(sessions):
+        session_id = f"{name}-{session}"
+        agent = create_agent(session_id, memory)
+        for turn in range(turns):
+            started = time.perf_counter()
+            await agent.invoke_async(PROMPTS[turn % len(PROMPTS)])
+            turn_times.append(time.perf_counter() - started)
+        close(agent)
+
+        # A new agent for the same session, as after the agent was evicted from the cache
+        started = time.perf_counter()
+        close(create_agent(session_id, memory))
+        restore_times.append(time.perf_counter() - started)
+
+    turn = statistics.median(turn_times)
+    print(
+        f"{name:<15} turn {turn * 1000:7.2f} ms"
+        f"  restore {statistics.median(restore_times) * 1000:7.2f} ms"
+        f"  (median of {len(turn_times)} turns, {sessions} sessions)"
+    )
+    return turn
+
+
+async def main(sessions: int, turns: int) -> None:
+    without = await run("without memory", sessions, turns, memory=False)
+    with_memory = await run("with memory", sessions, turns, memory=True)
+    print(f"memory adds {(with_memory - without) * 1000:.2f} ms per turn")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--turns", type=int, default=10)
+    args = parser.parse_args()
+    asyncio.run(main(args.sessions, args.turns))
@@ -0,0 +1,207 @@
+import asyncio
+import gc
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Optional
+
+from opentelemetry import metrics
+from strands import Agent
+
+logger = logging.getLogger(__name__)
+meter = metrics.get_meter(__name__)
+
+# Tune these with environment variables to size the cache for your traffic
+MAX_ENTRIES = int(os.getenv("AGENT_CACHE_MAX_ENTRIES", "256"))
+IDLE_TTL_SECONDS = float(os.getenv("AGENT_CACHE_IDLE_TTL_SECONDS", "900"))
+# Optional resident memory budget for the whole process, 0 disables it
+MAX_RSS_MB = int(os.getenv("AGENT_CACHE_MAX_RSS_MB", "0"))
+
+_hits = meter.create_counter("agent_cache.hits", description="Agent cache lookups served from the cache")
+_misses = meter.create_counter("agent_cache.misses", description="Agent cache lookups that created a new agent")
+_evictions = meter.create_counter("agent_cache.evictions", description="Agents evicted from the cache")
+
+# Tears down evicted agents one at a time, off the event loop
+_teardown_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="agent-teardown")
+
+
+def _rss_bytes() -> Optional[int]:
+    """Return the resident set size of this process, or None if it cannot be read."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _teardown(agent: Agent) -> None:
+    """Release the resources held by an evicted agent."""
+    session_manager = getattr(agent, "_session_manager", None)
+    close = getattr(session_manager, "close", None)
+    try:
+        if close:
+            # Flushes any buffered conversation events to AgentCore Memory
+            close()
+        # Releases this agent's hold on shared MCP clients
+        agent.cleanup()
+    except Exception:
+        logger.exception("Failed to tear down evicted agent")
+
+
+@dataclass
+class _Entry:
+    agent: Agent
+    last_used: float
+    # Requests currently using the agent, an entry is only evicted while this is 0
+    leases: int = 0
+
+
+class AgentCache:
+    """
+    Bounded LRU cache of per-session agents.
+
+    Requests take a lease on their agent with lease(), and only agents without a lease are
+    evicted: when the cache holds more than max_entries, when they have been idle for longer
+    than idle_ttl seconds, or one at a time while the process is over its memory budget. While
+    every agent is in use the cache may briefly hold more than max_entries. Evicted agents are
+    torn down on a background thread, so their session managers flush and close without
+    blocking the event loop.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = MAX_ENTRIES,
+        idle_ttl: float = IDLE_TTL_SECONDS,
+        max_rss_bytes: int = MAX_RSS_MB * 1024 * 1024,
+    ):
+        self.max_entries = max(1, max_entries)
+        self.idle_ttl = idle_ttl
+        self.max_rss_bytes = max_rss_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @asynccontextmanager
+    async def lease(self, key: str, create: Callable[[], Agent]) -> AsyncIterator[Agent]:
+        """
+        Hold the cached agent for key while the block runs, calling create() to build it on a miss.
+        Creating an agent restores its session over the network, so it runs off the event loop.
+        """
+        agent = await asyncio.to_thread(self._acquire, key, create)
+        try:
+            yield agent
+        finally:
+            self._release(key, agent)
+
+    def clear(self) -> None:
+        """Evict and tear down every cached agent, waiting for their session managers to flush."""
+        with self._lock:
+            evicted = [entry.agent for entry in self._entries.values()]
+            self._entries.clear()
+            self.evictions += len(evicted)
+        for agent in evicted:
+            _teardown(agent)
+
+    def stats(self) -> dict:
+        """Return cache counters for sizing the cache."""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "leased": sum(1 for entry in self._entries.values() if entry.leases),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def _acquire(self, key: str, create: Callable[[], Agent]) -> Agent:
+        now = time.monotonic()
+        with self._lock:
+            evicted = self._expire(now)
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.last_used = now
+                entry.leases += 1
+                self._entries.move_to_end(key)
+                self.hits += 1
+                _hits.add(1)
+            else:
+                self.misses += 1
+                _misses.add(1)
+        self._teardown_later(evicted)
+        if entry is not None:
+            return entry.agent
+
+        # Build outside the lock, creating an agent restores its session over the network
+        agent = create()
+        with self._lock:
+            existing = self._entries.get(key)
+            if existing is None:
+                self._entries[key] = _Entry(agent, time.monotonic(), leases=1)
+                evicted = self._shrink()
+            else:
+                existing.leases += 1
+        if existing is not None:
+            # Another caller created this session's agent first, keep theirs
+            self._teardown_later([agent])
+            return existing.agent
+        self._teardown_later(evicted)
+        return agent
+
+    def _release(self, key: str, agent: Agent) -> None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.agent is not agent:
+                return
+            entry.leases -= 1
+            # The idle TTL counts from the end of the last request
+            entry.last_used = time.monotonic()
+            self._entries.move_to_end(key)
+            evicted = self._shrink()
+        self._teardown_later(evicted)
+
+    def _expire(self, now: float) -> list[Agent]:
+        """Pop idle entries unused for longer than the TTL. Caller holds the lock."""
+        evicted = []
+        for key, entry in list(self._entries.items()):
+            if now - entry.last_used < self.idle_ttl:
+                break
+            if not entry.leases:
+                del self._entries[key]
+                evicted.append(entry.agent)
+        return evicted
+
+    def _shrink(self) -> list[Agent]:
+        """Pop least recently used idle entries until within bounds. Caller holds the lock."""
+        evicted = []
+        idle = [key for key, entry in self._entries.items() if not entry.leases]
+        while len(self._entries) > self.max_entries and idle:
+            evicted.append(self._entries.pop(idle.pop(0)).agent)
+        if self.max_rss_bytes and idle and len(self._entries) > 1:
+            rss = _rss_bytes()
+            if rss is not None and rss > self.max_rss_bytes:
+                evicted.append(self._entries.pop(idle.pop(0)).agent)
+        return evicted
+
+    def _teardown_later(self, evicted: list[Agent]) -> None:
+        if not evicted:
+            return
+        with self._lock:
+            self.evictions += len(evicted)
+        _evictions.add(len(evicted))
+        logger.debug("Evicting %d agent(s) from the agent cache", len(evicted))
+        # Flushing a session manager makes blocking AgentCore Memory calls
+        _teardown_executor.submit(self._teardown_all, evicted)
+
+    def _teardown_all(self, evicted: list[Agent]) -> None:
+        for agent in evicted:
+            _teardown(agent)
+        if self.max_rss_bytes:
+            # Return the evicted agents' memory promptly when running under a budget
+            gc.collect()
@@ -0,0 +1,328 @@
+import json
+import math
+import re
+import sqlite3
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Optional
+
+from botocore.exceptions import ClientError
+
+# Turns kept in each session's summary, oldest turns are dropped first
+SUMMARY_MAX_TURNS = 10
+# Characters of each message kept in a summary
+SUMMARY_MAX_CHARS = 200
+# BM25 term frequency saturation and document length normalization
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_WORD = re.compile(r"\w+")
+_SENTENCE = re.compile(r"(?<=[.!?])\s+|\n+")
+# Retrieved memories injected into a user message, such as <user_context>...</user_context>
+_CONTEXT_BLOCK = re.compile(r"^<(\w+)>.*</\1>$", re.S)
+_PREFERENCE = re.compile(
+    r"\b(i (?:really )?(?:like|love|prefer|enjoy|hate|dislike|want|avoid)|i'd rather|my favou?rite)\b", re.I
+)
+_STOPWORDS = frozenset(
+    "a an and are as at be but by do does for from has have how i in is it me my of on or so that the this to "
+    "was what when where which who why will with you your".split()
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    event_id TEXT PRIMARY KEY,
+    memory_id TEXT NOT NULL,
+    actor_id TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    event_timestamp REAL NOT NULL,
+    payload TEXT NOT NULL,
+    metadata TEXT,
+    branch TEXT
+);
+CREATE INDEX IF NOT EXISTS events_by_session ON events (memory_id, actor_id, session_id, event_timestamp);
+CREATE TABLE IF NOT EXISTS records (
+    record_id TEXT PRIMARY KEY,
+    memory_id TEXT NOT NULL,
+    namespace TEXT NOT NULL,
+    strategy TEXT NOT NULL,
+    text TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS records_by_namespace ON records (memory_id, namespace);
+"""
+
+
+def _terms(text: str) -> list[str]:
+    return [word for word in _WORD.findall(text.lower()) if word not in _STOPWORDS]
+
+
+def _message_texts(text: str) -> list[str]:
+    """Text blocks of a conversational payload, which Strands stores as a serialized SessionMessage."""
+    try:
+        content = json.loads(text)["message"]["content"]
+    except (ValueError, KeyError, TypeError):
+        return [text]
+    return [
+        block["text"]
+        for block in content
+        if isinstance(block, dict) and isinstance(block.get("text"), str) and not _CONTEXT_BLOCK.match(block["text"])
+    ]
+
+
+def _not_found(operation: str, message: str) -> ClientError:
+    return ClientError({"Error": {"Code": "ResourceNotFoundException", "Message": message}}, operation)
+
+
+class LocalMemoryClient:
+    """
+    SQLite stand-in for the AgentCore Memory data plane, for developing and load-testing offline.
+
+    Implements the bedrock-agentcore client calls made by AgentCoreMemorySessionManager:
+    create_event, get_event, list_events, delete_event and retrieve_memory_records, with the
+    same request and response shapes as boto3.
+
+    Long-term memory strategies run as each event is stored, on the user's and assistant's
+    text. SEMANTIC keeps each statement the user makes, USER_PREFERENCE keeps the ones that
+    state a like or dislike, and SUMMARIZATION keeps the session's latest turns as one record.
+    strategies maps each strategy to its namespace template, such as "/users/{actorId}/facts".
+    Records are retrieved by BM25 ranking against the query, and each score is relative to
+    the best match, so the top record always scores 1.0.
+    """
+
+    def __init__(self, path: str, strategies: Optional[dict[str, str]] = None):
+        self.strategies = strategies or {}
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def create_event(self, memoryId, actorId, sessionId, payload, eventTimestamp, metadata=None, branch=None, **kwargs):
+        timestamp = eventTimestamp.timestamp()
+        event_id = f"{int(timestamp * 1000):019d}#{uuid.uuid4().hex[:8]}"
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT INTO events VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    event_id,
+                    memoryId,
+                    actorId,
+                    sessionId,
+                    timestamp,
+                    json.dumps(payload),
+                    json.dumps(metadata) if metadata else None,
+                    json.dumps(branch) if branch else None,
+                ),
+            )
+            self._extract(memoryId, actorId, sessionId, payload)
+        return {"event": self._event(event_id, memoryId, actorId, sessionId, timestamp, payload, metadata, branch)}
+
+    def get_event(self, memoryId, actorId, sessionId, eventId, **kwargs):
+        with self._lock:
+            row = self._db.execute(
+                "SELECT * FROM events WHERE event_id = ? AND memory_id = ? AND actor_id = ? AND session_id = ?",
+                (eventId, memoryId, actorId, sessionId),
+            ).fetchone()
+        if row is None:
+            raise _not_found("GetEvent", f"Event {eventId} not found")
+        return {"event": self._row_to_event(row)}
+
+    def list_events(
+        self, memoryId, actorId, sessionId, maxResults=100, includePayloads=True, nextToken=None, filter=None, **kwargs
+    ):
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT * FROM events WHERE memory_id = ? AND actor_id = ? AND session_id = ? "
+                "ORDER BY event_timestamp DESC, rowid DESC",
+                (memoryId, actorId, sessionId),
+            ).fetchall()
+        events = [self._row_to_event(row) for row in rows]
+        events = [event for event in events if self._matches(event, filter or {})]
+        start = int(nextToken or 0)
+        page = events[start : start + maxResults]
+        if not includePayloads:
+            for event in page:
+                event.pop("payload")
+        response = {"events": page}
+        if start + maxResults < len(events):
+            response["nextToken"] = str(start + maxResults)
+        return response
+
+    def delete_event(self, memoryId, actorId, sessionId, eventId, **kwargs):
+        with self._lock, self._db:
+            deleted = self._db.execute(
+                "DELETE FROM events WHERE event_id = ? AND memory_id = ? AND actor_id = ? AND session_id = ?",
+                (eventId, memoryId, actorId, sessionId),
+            ).rowcount
+        if not deleted:
+            raise _not_found("DeleteEvent", f"Event {eventId} not found")
+        return {"eventId": eventId}
+
+    def retrieve_memory_records(self, memoryId, searchCriteria, namespace=None, namespacePath=None, **kwargs):
+        with self._lock:
+            if namespace is not None:
+                rows = self._db.execute(
+                    "SELECT * FROM records WHERE memory_id = ? AND namespace = ?", (memoryId, namespace)
+                ).fetchall()
+            else:
+                prefix = namespacePath.rstrip("/")
+                rows = self._db.execute(
+                    "SELECT * FROM records WHERE memory_id = ? AND (namespace = ? OR namespace LIKE ? ESCAPE '\\')",
+                    (memoryId, prefix, prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "/%"),
+                ).fetchall()
+        scored = self._rank(_terms(searchCriteria["searchQuery"]), rows)[: searchCriteria.get("topK", 10)]
+        return {
+            "memoryRecordSummaries": [
+                {
+                    "memoryRecordId": record_id,
+                    "content": {"text": text},
+                    "memoryStrategyId": strategy,
+                    "namespaces": [namespace],
+                    "createdAt": datetime.fromtimestamp(created_at, timezone.utc),
+                    "score": score,
+                }
+                for (record_id, _, namespace, strategy, text, created_at), score in scored
+            ]
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    @staticmethod
+    def _rank(query: list[str], rows: list[tuple]) -> list[tuple[tuple, float]]:
+        """Rank records by BM25 against the query terms, dropping records that share none."""
+        if not query or not rows:
+            return []
+        documents = [Counter(_terms(row[4])) for row in rows]
+        average_length = sum(sum(document.values()) for document in documents) / len(documents) or 1.0
+        frequency = Counter(term for document in documents for term in set(document))
+        scores = []
+        for row, document in zip(rows, documents):
+            length = sum(document.values())
+            score = 0.0
+            for term in set(query):
+                count = document.get(term, 0)
+                if count:
+                    idf = math.log(1 + (len(documents) - frequency[term] + 0.5) / (frequency[term] + 0.5))
+                    score += idf * count * (BM25_K1 + 1) / (
+                        count + BM25_K1 * (1 - BM25_B + BM25_B * length / average_length)
+                    )
+            if score > 0:
+                scores.append((row, score))
+        scores.sort(key=lambda scored: scored[1], reverse=True)
+        best = scores[0][1] if scores else 1.0
+        return [(row, score / best) for row, score in scores]
+
+    def _extract(self, memory_id: str, actor_id: str, session_id: str, payload: list[dict]) -> None:
+        """Run the configured strategies over a new event. Caller holds the lock and a transaction."""
+        turns = []
+        for item in payload:
+            conversational = item.get("conversational")
+            if conversational:
+                for text in _message_texts(conversational["content"]["text"]):
+                    turns.append((conversational["role"], text.strip()))
+        if not turns:
+            return
+
+        now = time.time()
+        for strategy, template in self.strategies.items():
+            namespace = template.format(actorId=actor_id, sessionId=session_id, memoryStrategyId=strategy)
+            if strategy == "SUMMARIZATION":
+                self._summarize(memory_id, namespace, turns, now)
+                continue
+            for role, text in turns:
+                if role != "USER":
+                    continue
+                for sentence in _SENTENCE.split(text):
+                    sentence = sentence.strip()
+                    if len(_terms(sentence)) < 2 or sentence.endswith("?"):
+                        continue
+                    if strategy == "USER_PREFERENCE" and not _PREFERENCE.search(sentence):
+                        continue
+                    self._db.execute(
+                        "INSERT OR IGNORE INTO records VALUES (?, ?, ?, ?, ?, ?)",
+                        (
+                            str(uuid.uuid5(uuid.NAMESPACE_URL, f"{memory_id}{namespace}{sentence}")),
+                            memory_id,
+                            namespace,
+                            strategy,
+                            sentence,
+                            now,
+                        ),
+                    )
+
+    def _summarize(self, memory_id: str, namespace: str, turns: list[tuple[str, str]], now: float) -> None:
+        record_id = str(uuid.uuid5(uuid.NAMESPACE_URL, f"{memory_id}{namespace}"))
+        row = self._db.execute("SELECT text FROM records WHERE record_id = ?", (record_id,)).fetchone()
+        lines = row[0].split("\n") if row else []
+        lines += [f"{role.lower()}: {text[:SUMMARY_MAX_CHARS]}" for role, text in turns if text]
+        self._db.execute(
+            "INSERT OR REPLACE INTO records VALUES (?, ?, ?, ?, ?, ?)",
+            (record_id, memory_id, namespace, "SUMMARIZATION", "\n".join(lines[-SUMMARY_MAX_TURNS:]), now),
+        )
+
+    @staticmethod
+    def _matches(event: dict, filter: dict) -> bool:
+        branch = filter.get("branch")
+        if branch:
+            name = (event.get("branch") or {}).get("name", "main")
+            if name != branch["name"] and not (branch.get("includeParentBranches") and name == "main"):
+                return False
+        metadata = event.get("metadata") or {}
+        for expression in filter.get("eventMetadata") or []:
+            value = metadata.get(expression["left"]["metadataKey"])
+            operator = expression["operator"]
+            if operator == "EXISTS" and value is None:
+                return False
+            if operator == "NOT_EXISTS" and value is not None:
+                return False
+            if operator == "EQUALS_TO" and value != expression["right"]["metadataValue"]:
+                return False
+        return True
+
+    def _row_to_event(self, row: tuple) -> dict:
+        event_id, memory_id, actor_id, session_id, timestamp, payload, metadata, branch = row
+        return self._event(
+            event_id,
+            memory_id,
+            actor_id,
+            session_id,
+            timestamp,
+            json.loads(payload),
+            json.loads(metadata) if metadata else None,
+            json.loads(branch) if branch else None,
+        )
+
+    @staticmethod
+    def _event(event_id, memory_id, actor_id, session_id, timestamp, payload, metadata, branch) -> dict:
+        event = {
+            "memoryId": memory_id,
+            "actorId": actor_id,
+            "sessionId": session_id,
+            "eventId": event_id,
+            "eventTimestamp": datetime.fromtimestamp(timestamp, timezone.utc),
+            "payload": payload,
+        }
+        if metadata:
+            event["metadata"] = metadata
+        if branch:
+            event["branch"] = branch
+        return event
+
+
+class LocalMemorySession:
+    """
+    Stands in for the boto3 session given to AgentCoreMemorySessionManager, so every client it
+    creates is the shared LocalMemoryClient. Control plane calls are not implemented.
+    """
+
+    region_name = None
+
+    def __init__(self, client: LocalMemoryClient):
+        self._client = client
+
+    def client(self, service_name: str, **kwargs) -> LocalMemoryClient:
+        return self._client
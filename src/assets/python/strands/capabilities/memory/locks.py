@@ -0,0 +1,104 @@
+import asyncio
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+from opentelemetry import metrics
+
+logger = logging.getLogger(__name__)
+meter = metrics.get_meter(__name__)
+
+# Seconds a request waits for an in-flight request on the same session.
+# 0 rejects a busy session immediately, a negative value waits indefinitely.
+_timeout = float(os.getenv("SESSION_LOCK_TIMEOUT_SECONDS", "30"))
+LOCK_TIMEOUT_SECONDS = _timeout if _timeout >= 0 else None
+
+_wait_time = meter.create_histogram(
+    "session_lock.wait_time",
+    unit="s",
+    description="Time a request waited for its session to become free",
+)
+_rejections = meter.create_counter("session_lock.rejections", description="Requests rejected because their session was busy")
+
+
+class SessionBusyError(RuntimeError):
+    """Raised when a session is still busy with another request after the lock timeout."""
+
+
+class SessionLocks:
+    """
+    Per-session asyncio locks.
+
+    Requests for the same session are serialized so they never share a conversation history
+    concurrently, while requests for different sessions run in parallel. Locks are removed
+    once no request holds or waits for them.
+    """
+
+    def __init__(self, timeout: Optional[float] = LOCK_TIMEOUT_SECONDS):
+        self.timeout = timeout
+        self._locks: dict[str, tuple[asyncio.Lock, int]] = {}
+
+    @asynccontextmanager
+    async def hold(self, key: str) -> AsyncIterator[None]:
+        """Hold the lock for key, raising SessionBusyError if it cannot be acquired in time."""
+        lock, users = self._locks.get(key) or (asyncio.Lock(), 0)
+        self._locks[key] = (lock, users + 1)
+        try:
+            await self._acquire(key, lock)
+            try:
+                yield
+            finally:
+                lock.release()
+        finally:
+            lock, users = self._locks[key]
+            if users > 1:
+                self._locks[key] = (lock, users - 1)
+            else:
+                del self._locks[key]
+
+    async def _acquire(self, key: str, lock: asyncio.Lock) -> None:
+        start = time.monotonic()
+        try:
+            if self.timeout == 0:
+                if lock.locked():
+                    raise SessionBusyError(f"Session {key} is busy with another request")
+                await lock.acquire()
+                return
+            if not await self._acquire_within(lock):
+                raise SessionBusyError(f"Session {key} is still busy with another request after {self.timeout}s")
+        except SessionBusyError:
+            _rejections.add(1)
+            raise
+        finally:
+            waited = time.monotonic() - start
+            _wait_time.record(waited)
+            if waited > 1:
+                logger.info("Waited %.2fs for session %s to become free", waited, key)
+
+    async def _acquire_within(self, lock: asyncio.Lock) -> bool:
+        """Acquire lock, returning False if it is not acquired within the timeout."""
+        if hasattr(asyncio, "timeout"):
+            try:
+                async with asyncio.timeout(self.timeout):
+                    await lock.acquire()
+                return True
+            except TimeoutError:
+                return False
+        # Before Python 3.11 there is no asyncio.timeout, and asyncio.wait_for can time out just
+        # after the acquire succeeded, leaving the lock held. The acquire runs as a task instead,
+        # and if it completes after all, the lock is released for the next request.
+        acquire = asyncio.ensure_future(lock.acquire())
+        try:
+            await asyncio.wait({acquire}, timeout=self.timeout)
+        finally:
+            if not acquire.done():
+                acquire.cancel()
+                acquire.add_done_callback(lambda task: _release_if_acquired(task, lock))
+        return acquire.done() and acquire.result()
+
+
+def _release_if_acquired(acquire: asyncio.Future, lock: asyncio.Lock) -> None:
+    if not acquire.cancelled():
+        lock.release()
@@ -0,0 +1,65 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable
+
+from opentelemetry import metrics
+
+meter = metrics.get_meter(__name__)
+
+# Seconds long-term memories retrieved for a query are reused, 0 retrieves them on every turn
+TTL_SECONDS = float(os.getenv("MEMORY_RETRIEVAL_CACHE_TTL_SECONDS", "60"))
+# Retrievals kept across all sessions before the least recently used is dropped
+MAX_ENTRIES = int(os.getenv("MEMORY_RETRIEVAL_CACHE_MAX_ENTRIES", "1024"))
+
+_hits = meter.create_counter("memory_retrieval.cache_hits", description="Long-term memory retrievals served from the cache")
+_misses = meter.create_counter("memory_retrieval.cache_misses", description="Long-term memory retrievals sent to AgentCore Memory")
+
+
+class RetrievalCache:
+    """
+    Process-wide TTL cache of long-term memory retrievals, keyed by actor, namespace and query.
+
+    A query the actor repeats within the TTL, such as a retried request or the same question in
+    another of the actor's sessions, is answered without a round trip to AgentCore Memory.
+    Empty results are not cached, because AgentCore Memory also returns them when a retrieval
+    fails. A session that writes conversation events drops its actor's cached retrievals, see
+    memory/session.py.
+    """
+
+    def __init__(self, ttl: float = TTL_SECONDS, max_entries: int = MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max(1, max_entries)
+        self._entries: OrderedDict[tuple, tuple[list, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, actor_id: str, namespace: str, query: str, retrieve: Callable[[], list]) -> list:
+        """Return the cached memories for this lookup, calling retrieve() to fetch them on a miss."""
+        if self.ttl <= 0:
+            return retrieve()
+        key = (actor_id, namespace, query)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[1] < self.ttl:
+                self._entries.move_to_end(key)
+                _hits.add(1)
+                return entry[0]
+        _misses.add(1)
+
+        # Retrieve outside the lock, namespaces of one turn are retrieved concurrently
+        memories = retrieve()
+        if memories:
+            with self._lock:
+                self._entries[key] = (memories, time.monotonic())
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return memories
+
+    def invalidate(self, actor_id: str) -> None:
+        """Drop every cached retrieval of the given actor."""
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == actor_id]:
+                del self._entries[key]
@@ -1,11 +1,127 @@
 import os
+import threading
 from typing import Optional
 
 from bedrock_agentcore.memory.integrations.strands.config import AgentCoreMemoryConfig{{#if memoryProviders.[0].strategies.length}}, RetrievalConfig{{/if}}
 from bedrock_agentcore.memory.integrations.strands.session_manager import AgentCoreMemorySessionManager
+from memory.local import LocalMemoryClient, LocalMemorySession
+from memory.retrieval import RetrievalCache
 
-MEMORY_ID = os.getenv("{{memoryProviders.[0].envVarName}}")
+# "agentcore" stores sessions in AgentCore Memory, "local" in a SQLite file for developing and
+# load-testing offline, such as under agentcore dev, see memory/local.py
+MEMORY_BACKEND = os.getenv("MEMORY_BACKEND", "agentcore").lower()
+LOCAL_MEMORY_PATH = os.getenv("LOCAL_MEMORY_PATH", "memory.sqlite")
+MEMORY_ID = os.getenv("{{memoryProviders.[0].envVarName}}") or ("local" if MEMORY_BACKEND == "local" else None)
 REGION = os.getenv("AWS_REGION")
+# Conversation events buffered per session before they are written in one batch, 1 writes each event as it happens
+BATCH_SIZE = min(max(int(os.getenv("MEMORY_BATCH_SIZE", "10")), 1), 100)
+# Seconds between background flushes of a session's buffer, 0 only flushes on size, end of invocation and shutdown
+FLUSH_INTERVAL_SECONDS = float(os.getenv("MEMORY_FLUSH_INTERVAL_SECONDS", "30"))
+{{#if memoryProviders.[0].strategies.length}}
+
+# Shared by every session so an actor's repeated queries skip the retrieval round trip, see memory/retrieval.py
+_retrieval_cache = RetrievalCache()
+{{/if}}
+
+
+class OrderedMemorySessionManager(AgentCoreMemorySessionManager):
+    """
+    AgentCore Memory session manager that writes conversation events behind the agent.
+
+    Events are buffered and written in batches when the buffer reaches batch_size, every
+    flush_interval_seconds, at the end of each invocation and when the manager is closed.
+    Buffered writes run off the event loop, so a turn never waits on a persistence round trip.
+
+    Flushes from the timer, the size limit and the end of an invocation run one at a time,
+    and a batch that fails to write is retried ahead of the events buffered after it, so a
+    session's events are always stored in the order they happened. This relies on private
+    hooks of the SDK's session manager, which is why pyproject.toml caps bedrock-agentcore.
+
+    Long-term memories retrieved before each model turn are served from retrieval_cache, if
+    given, and the actor's cached retrievals are dropped whenever this session writes events.
+    """
+
+    def __init__(self, *args, retrieval_cache: Optional[RetrievalCache] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._flush_lock = threading.RLock()
+        self._retrieval_cache = retrieval_cache
+        if retrieval_cache is not None:
+            retrieve = self.memory_client.retrieve_memories
+            actor_id = self.config.actor_id
+
+            def retrieve_memories(memory_id, namespace_path, query, top_k=3):
+                return retrieval_cache.get(
+                    actor_id,
+                    namespace_path,
+                    query,
+                    lambda: retrieve(memory_id=memory_id, namespace_path=namespace_path, query=query, top_k=top_k),
+                )
+
+            self.memory_client.retrieve_memories = retrieve_memories
+
+    def create_message(self, *args, **kwargs):
+        event = super().create_message(*args, **kwargs)
+        if event:
+            # Written immediately rather than buffered
+            self._invalidate_retrievals()
+        return event
+
+    def _invalidate_retrievals(self) -> None:
+        if self._retrieval_cache is not None:
+            self._retrieval_cache.invalidate(self.config.actor_id)
+
+    def _flush_messages_only(self):
+        with self._flush_lock:
+            try:
+                results = super()._flush_messages_only()
+                if results:
+                    self._invalidate_retrievals()
+                return results
+            except Exception:
+                # The failed batch was put back behind newer events, timestamps restore their order
+                with self._message_lock:
+                    self._message_buffer.sort(key=lambda message: message.timestamp)
+                raise
+
+    def _flush_agent_states_only(self):
+        with self._flush_lock:
+            try:
+                return super()._flush_agent_states_only()
+            except Exception:
+                with self._agent_state_lock:
+                    self._agent_state_buffer.sort(key=lambda state: state[1].updated_at)
+                raise
+
+
+_local_session = None
+_local_session_lock = threading.Lock()
+
+
+def _get_boto_session() -> Optional[LocalMemorySession]:
+    """Returns the local stand-in for AgentCore Memory when MEMORY_BACKEND selects it."""
+    global _local_session
+    if MEMORY_BACKEND == "agentcore":
+        return None
+    if MEMORY_BACKEND != "local":
+        raise ValueError(f"Unknown MEMORY_BACKEND {MEMORY_BACKEND!r}, expected 'agentcore' or 'local'")
+    if _local_session is None:
+        with _local_session_lock:
+            if _local_session is None:
+                # Long-term memories are written to the namespaces retrieved below
+                strategies = {
+{{#if (includes memoryProviders.[0].strategies "SEMANTIC")}}
+                    "SEMANTIC": "/users/{actorId}/facts",
+{{/if}}
+{{#if (includes memoryProviders.[0].strategies "USER_PREFERENCE")}}
+                    "USER_PREFERENCE": "/users/{actorId}/preferences",
+{{/if}}
+{{#if (includes memoryProviders.[0].strategies "SUMMARIZATION")}}
+                    "SUMMARIZATION": "/summaries/{actorId}/{sessionId}",
+{{/if}}
+                }
+                _local_session = LocalMemorySession(LocalMemoryClient(LOCAL_MEMORY_PATH, strategies))
+    return _local_session
+
 
 def get_memory_session_manager(session_id: str, actor_id: str) -> Optional[AgentCoreMemorySessionManager]:
     if not MEMORY_ID:
@@ -25,7 +141,7 @@ def get_memory_session_manager(session_id: str, actor_id: str) -> Optional[Agent
     }
 {{/if}}
 
-    return AgentCoreMemorySessionManager(
+    return OrderedMemorySessionManager(
         AgentCoreMemoryConfig(
             memory_id=MEMORY_ID,
             session_id=session_id,
@@ -33,7 +149,15 @@ def get_memory_session_manager(session_id: str, actor_id: str) -> Optional[Agent
 {{#if memoryProviders.[0].strategies.length}}
             retrieval_config=retrieval_config,
 {{/if}}
+            batch_size=BATCH_SIZE,
+            flush_interval_seconds=FLUSH_INTERVAL_SECONDS or None,
+            # Persistence calls run in a worker thread, the agent is invoked with stream_async
+            async_mode=True,
         ),
-        REGION
+        REGION,
+        boto_session=_get_boto_session(),
+{{#if memoryProviders.[0].strategies.length}}
+        retrieval_cache=_retrieval_cache,
+{{/if}}
     )
 